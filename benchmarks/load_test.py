@@ -0,0 +1,624 @@
+"""여러 세션이 동시에 앱을 쓰는 상황을 흉내 내어 지연 시간, 처리량, 세션당 메모리를 잰다.
+
+    python benchmarks/load_test.py                                   # AppTest 세션 1, 5, 10개
+    python benchmarks/load_test.py --target server --sessions 5,20   # 로컬 Streamlit 서버에 웹소켓으로 접속
+    python benchmarks/load_test.py --mix simulator --iterations 5 --out load.json
+
+대상
+    apptest  이 프로세스 안에서 Streamlit AppTest 인스턴스를 세션마다 하나씩 만들어 스레드로 돌린다.
+             스크립트 실행은 전체 재실행만 흉내 낸다. (fragment만 다시 실행하지 않음)
+    server   단계마다 `streamlit run main.py`를 새로 띄우고 세션마다 웹소켓을 하나씩 연다.
+             브라우저처럼 위젯 상태를 보내므로 fragment 안의 위젯은 fragment만 다시 실행한다.
+             메모리는 서버 프로세스의 RSS를 잰다.
+
+상호작용 묶음 (--mix)
+    calculator  사칙연산 입력 후 '계산하기' 클릭 반복
+    simulator   시뮬레이터로 이동 후 10만 회(--n-trials) 동전 던지기 반복 (시드 없이 매번 새로 계산)
+    population  세계 인구로 이동 후 연도 슬라이더를 1970년부터 차례로 이동
+    classroom   세션마다 위 셋 중 하나 (5 : 3 : 2 비율)
+
+동시 세션 수마다 p50/p95/p99 지연 시간, 초당 처리 건수, 세션당 RSS 증가량을 보고하고,
+메모리(사용 가능 메모리 / 세션당 증가량), 지연 시간(p95 목표를 지킨 최대 세션 수),
+처리량(최대 처리량 × 학생 한 명의 조작 간격)으로 이 기계에서 받을 수 있는 세션 수를 추정한다.
+"""
+import argparse
+import asyncio
+import gc
+import json
+import logging
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN_PATH = os.path.join(ROOT, "main.py")
+
+DEFAULT_SESSIONS = "1,5,10"
+DEFAULT_ITERATIONS = 10
+DEFAULT_N_TRIALS = 100_000
+DEFAULT_SLO_P95 = 2.0
+DEFAULT_ACTION_INTERVAL = 10.0
+SERVER_START_TIMEOUT = 60.0
+RUN_TIMEOUT = 600.0
+
+MIXES = ("calculator", "simulator", "population", "classroom")
+CLASSROOM_WEIGHTS = {"calculator": 5, "simulator": 3, "population": 2}
+
+APP_MODE_LABEL = "사용할 앱 선택"
+POPULATION_YEARS = list(range(1970, 2023))
+
+
+# =============================================================================
+# 상호작용 묶음
+# =============================================================================
+# 단계는 튜플 하나: ("set", 위젯 종류, 라벨, 값) 은 값만 바꾸고, ("run", 이름) 은 재실행,
+# ("click", 버튼 라벨, 이름) 은 버튼을 누른 재실행이다. 이름이 있는 단계의 시간만 기록한다.
+def calculator_steps(rng, iterations, n_trials):
+    for _ in range(iterations):
+        yield ("set", "number_input", "첫 번째 수 (a)", float(rng.randint(-1000, 1000)))
+        yield ("set", "number_input", "두 번째 수 (b)", float(rng.randint(1, 1000)))
+        yield ("click", "계산하기", "calculator-click")
+
+
+def simulator_steps(rng, iterations, n_trials):
+    yield ("set", "radio", APP_MODE_LABEL, "확률 시뮬레이터")
+    yield ("run", "switch-app")
+    yield ("set", "number_input", "시행 횟수", n_trials)
+    for _ in range(iterations):
+        yield ("click", "시뮬레이션 실행하기", f"simulate-{n_trials}")
+
+
+def population_steps(rng, iterations, n_trials):
+    yield ("set", "radio", APP_MODE_LABEL, "연도별 세계인구 분석")
+    yield ("run", "switch-app")
+    start = rng.randrange(len(POPULATION_YEARS))
+    for i in range(iterations):
+        year = POPULATION_YEARS[(start + i) % len(POPULATION_YEARS)]
+        yield ("set", "select_slider", "연도 선택", year)
+        yield ("run", "year-change")
+
+
+SCENARIOS = {
+    "calculator": calculator_steps,
+    "simulator": simulator_steps,
+    "population": population_steps,
+}
+
+
+def session_scenario(mix, index, seed):
+    # 세션 번호마다 같은 시나리오와 난수를 쓰도록 (seed, index)로 정한다.
+    rng = random.Random(seed * 1_000_003 + index)
+    if mix != "classroom":
+        return mix, rng
+    names = list(CLASSROOM_WEIGHTS)
+    return rng.choices(names, weights=[CLASSROOM_WEIGHTS[n] for n in names])[0], rng
+
+
+# =============================================================================
+# 세션: AppTest
+# =============================================================================
+class AppTestSession:
+    """AppTest 인스턴스 하나를 브라우저 세션 하나로 보고 단계를 실행한다."""
+
+    def __init__(self):
+        from streamlit.testing.v1 import AppTest
+
+        self.at = AppTest.from_file(MAIN_PATH, default_timeout=RUN_TIMEOUT)
+        self.errors = 0
+
+    def _run(self, target):
+        target.run()
+        self.errors += len(self.at.exception)
+
+    def _find(self, kind, label):
+        for widget in getattr(self.at, kind):
+            if widget.label == label:
+                return widget
+        raise LookupError(f"위젯을 찾을 수 없습니다: {kind} '{label}'")
+
+    def start(self):
+        self._run(self.at)
+
+    def set(self, kind, label, value):
+        self._find(kind, label).set_value(value)
+
+    def run(self):
+        self._run(self.at)
+
+    def click(self, label):
+        self._run(self._find("button", label).click())
+
+    def close(self):
+        pass
+
+
+def run_apptest_session(session, steps, think_time, samples):
+    t = time.perf_counter()
+    session.start()
+    samples.append(("first-load", time.perf_counter() - t))
+    for step in steps:
+        if step[0] == "set":
+            session.set(*step[1:])
+            continue
+        t = time.perf_counter()
+        if step[0] == "click":
+            session.click(step[1])
+        else:
+            session.run()
+        samples.append((step[-1], time.perf_counter() - t))
+        if think_time:
+            time.sleep(think_time)
+
+
+# =============================================================================
+# 세션: 로컬 서버 (웹소켓 + Streamlit protobuf)
+# =============================================================================
+class ServerSession:
+    """브라우저 대신 웹소켓으로 rerun 요청을 보내고 script_finished까지 기다린다.
+
+    받은 delta에서 위젯 (id, 종류, fragment id)을 라벨로 기억해 두고, 바꾼 값은 브라우저처럼
+    매 요청의 widget_states에 담아 보낸다. 바꾼 위젯이 모두 같은 fragment 안에 있으면
+    그 fragment만 다시 실행하도록 요청한다.
+    """
+
+    def __init__(self, url):
+        self.url = url
+        self.errors = 0
+        self.widgets = {}   # 라벨 -> (id, 종류, fragment id)
+        self.values = {}    # 위젯 id -> (종류, 값)  지금까지 바꾼 값
+        self.staged = []    # 다음 실행 전에 바꾼 위젯 id
+        self.ws = None
+
+    async def start(self):
+        import websockets
+
+        self.ws = await websockets.connect(self.url, subprotocols=["streamlit"], max_size=None)
+        await self._rerun()
+
+    def set(self, kind, label, value):
+        widget_id, _, _ = self._widget(label)
+        self.values[widget_id] = (kind, value)
+        self.staged.append(widget_id)
+
+    async def run(self):
+        await self._rerun()
+
+    async def click(self, label):
+        widget_id, _, fragment_id = self._widget(label)
+        await self._rerun(trigger_id=widget_id, fragment_id=fragment_id)
+
+    async def close(self):
+        if self.ws is not None:
+            await self.ws.close()
+
+    def _widget(self, label):
+        if label not in self.widgets:
+            raise LookupError(f"위젯을 찾을 수 없습니다: '{label}'")
+        return self.widgets[label]
+
+    @staticmethod
+    def _widget_state(widget_id, kind, value):
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        state = WidgetState(id=widget_id)
+        if kind == "radio":
+            state.string_value = str(value)
+        elif kind == "number_input":
+            state.double_value = float(value)
+        elif kind == "select_slider":
+            state.string_array_value.data.append(str(value))
+        elif kind == "checkbox":
+            state.bool_value = bool(value)
+        elif kind == "slider":
+            state.double_array_value.data.append(float(value))
+        else:
+            raise ValueError(f"지원하지 않는 위젯 종류: {kind}")
+        return state
+
+    async def _rerun(self, trigger_id=None, fragment_id=None):
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        if fragment_id is None:
+            fragments = {self._fragment_of(widget_id) for widget_id in self.staged}
+            fragment_id = fragments.pop() if len(fragments) == 1 else ""
+        self.staged = []
+
+        msg = BackMsg()
+        msg.rerun_script.query_string = ""
+        msg.rerun_script.fragment_id = fragment_id or ""
+        states = msg.rerun_script.widget_states.widgets
+        for widget_id, (kind, value) in self.values.items():
+            states.append(self._widget_state(widget_id, kind, value))
+        if trigger_id is not None:
+            states.append(WidgetState(id=trigger_id, trigger_value=True))
+        await self.ws.send(msg.SerializeToString())
+
+        seen = set()
+        while True:
+            fm = ForwardMsg()
+            fm.ParseFromString(await asyncio.wait_for(self.ws.recv(), RUN_TIMEOUT))
+            kind = fm.WhichOneof("type")
+            if kind == "delta" and fm.delta.WhichOneof("type") == "new_element":
+                element = fm.delta.new_element
+                element_type = element.WhichOneof("type")
+                if element_type == "exception":
+                    self.errors += 1
+                proto = getattr(element, element_type)
+                # 위젯만 (id, label)을 함께 가진다. (그래프/표는 id만 있음)
+                widget_id, label = getattr(proto, "id", ""), getattr(proto, "label", None)
+                if widget_id and label is not None:
+                    self.widgets[label] = (widget_id, element_type, fm.delta.fragment_id)
+                    seen.add(widget_id)
+            elif kind == "script_finished":
+                if fm.script_finished == ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    continue
+                if fm.script_finished == ForwardMsg.FINISHED_WITH_COMPILE_ERROR:
+                    self.errors += 1
+                break
+        # 전체 실행 뒤 화면에서 사라진 위젯의 값은 브라우저처럼 더 보내지 않는다.
+        if not fragment_id:
+            self.values = {k: v for k, v in self.values.items() if k in seen}
+
+    def _fragment_of(self, widget_id):
+        for wid, _, fragment_id in self.widgets.values():
+            if wid == widget_id:
+                return fragment_id
+        return ""
+
+
+async def run_server_session(session, steps, think_time, samples):
+    t = time.perf_counter()
+    await session.start()
+    samples.append(("first-load", time.perf_counter() - t))
+    for step in steps:
+        if step[0] == "set":
+            session.set(*step[1:])
+            continue
+        t = time.perf_counter()
+        if step[0] == "click":
+            await session.click(step[1])
+        else:
+            await session.run()
+        samples.append((step[-1], time.perf_counter() - t))
+        if think_time:
+            await asyncio.sleep(think_time)
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server():
+    """main.py를 로컬 Streamlit 서버로 띄우고 health 응답이 올 때까지 기다린다."""
+    port = _free_port()
+    proc = subprocess.Popen(
+        [
+            sys.executable, "-m", "streamlit", "run", MAIN_PATH,
+            "--server.headless", "true",
+            "--server.port", str(port),
+            "--server.address", "127.0.0.1",
+            "--server.enableXsrfProtection", "false",
+            "--browser.gatherUsageStats", "false",
+        ],
+        cwd=ROOT,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + SERVER_START_TIMEOUT
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError("Streamlit 서버가 시작되지 못했습니다.")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1) as resp:
+                if resp.status == 200:
+                    return proc, f"ws://127.0.0.1:{port}/_stcore/stream"
+        except OSError:
+            time.sleep(0.2)
+    proc.kill()
+    raise RuntimeError("Streamlit 서버가 제시간에 응답하지 않습니다.")
+
+
+# =============================================================================
+# 메모리
+# =============================================================================
+def rss_of(pid):
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def available_memory():
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+# =============================================================================
+# 한 단계 (동시 세션 N개) 실행
+# =============================================================================
+def session_plans(n_sessions, args):
+    plans = []
+    for i in range(n_sessions):
+        scenario, rng = session_scenario(args.mix, i, args.seed)
+        plans.append((scenario, list(SCENARIOS[scenario](rng, args.iterations, args.n_trials))))
+    return plans
+
+
+def warm_up_plan(args):
+    # 측정 전에 모든 화면을 한 번씩 돌려 공유 캐시(데이터, 그림, 모듈 import)를 채운다.
+    rng = random.Random(args.seed)
+    return [(name, list(steps(rng, 1, args.n_trials))) for name, steps in SCENARIOS.items()]
+
+
+def run_level_apptest(n_sessions, args):
+    for _, steps in warm_up_plan(args):
+        run_apptest_session(AppTestSession(), steps, 0, [])
+    gc.collect()
+    rss_before = rss_of(os.getpid())
+
+    plans = session_plans(n_sessions, args)
+    sessions = [AppTestSession() for _ in plans]
+    samples = [[] for _ in plans]
+    failures = []
+
+    def worker(i):
+        try:
+            run_apptest_session(sessions[i], plans[i][1], args.think_time, samples[i])
+        except Exception as e:  # 한 세션이 실패해도 나머지 측정은 계속한다.
+            failures.append(f"세션 {i}: {e!r}")
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(len(plans))]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - t0
+
+    # 세션 객체가 살아 있는 동안 잰다. (세션 상태가 메모리에 남아 있는 상태)
+    gc.collect()
+    rss_after = rss_of(os.getpid())
+    errors = sum(s.errors for s in sessions) + len(failures)
+    return plans, samples, wall, rss_before, rss_after, errors, failures
+
+
+def run_level_server(n_sessions, args):
+    proc, url = start_server()
+    try:
+        async def level():
+            for _, steps in warm_up_plan(args):
+                warm = ServerSession(url)
+                await run_server_session(warm, steps, 0, [])
+                await warm.close()
+            await asyncio.sleep(0.5)
+            rss_before = rss_of(proc.pid)
+
+            plans = session_plans(n_sessions, args)
+            sessions = [ServerSession(url) for _ in plans]
+            samples = [[] for _ in plans]
+            t0 = time.perf_counter()
+            results = await asyncio.gather(
+                *(run_server_session(s, p[1], args.think_time, out) for s, p, out in zip(sessions, plans, samples)),
+                return_exceptions=True,
+            )
+            wall = time.perf_counter() - t0
+            failures = [f"세션 {i}: {r!r}" for i, r in enumerate(results) if isinstance(r, BaseException)]
+            rss_after = rss_of(proc.pid)
+            for s in sessions:
+                await s.close()
+            errors = sum(s.errors for s in sessions) + len(failures)
+            return plans, samples, wall, rss_before, rss_after, errors, failures
+
+        return asyncio.run(level())
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+# =============================================================================
+# 집계 / 보고
+# =============================================================================
+def percentile(values, q):
+    # 최근접 순위 방식 백분위수 (q: 0~100)
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def latency_summary(values):
+    return {
+        "count": len(values),
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "max": max(values) if values else None,
+    }
+
+
+def summarize_level(n_sessions, plans, samples, wall, rss_before, rss_after, errors, failures):
+    flat = [s for session in samples for s in session]
+    # 처음 접속(first-load)은 따로 보고, 처리량과 전체 지연 시간은 조작 단계만으로 계산한다.
+    actions = [seconds for name, seconds in flat if name != "first-load"]
+    by_action = {}
+    for name, seconds in flat:
+        by_action.setdefault(name, []).append(seconds)
+
+    per_session = None
+    if rss_before is not None and rss_after is not None and n_sessions:
+        per_session = (rss_after - rss_before) / n_sessions
+    scenarios = {}
+    for name, _ in plans:
+        scenarios[name] = scenarios.get(name, 0) + 1
+    return {
+        "sessions": n_sessions,
+        "scenarios": scenarios,
+        "wall_seconds": wall,
+        "throughput": len(actions) / wall if wall > 0 else None,
+        "latency": latency_summary(actions),
+        "by_action": {name: latency_summary(values) for name, values in sorted(by_action.items())},
+        "rss_before": rss_before,
+        "rss_after": rss_after,
+        "rss_per_session": per_session,
+        "errors": errors,
+        "failures": failures[:10],
+    }
+
+
+def estimate_capacity(levels, slo_p95, action_interval, memory_budget):
+    """메모리 / 지연 시간 / 처리량 기준으로 받을 수 있는 동시 세션 수를 추정한다."""
+    estimate = {"slo_p95": slo_p95, "action_interval": action_interval, "memory_budget": memory_budget}
+
+    # 메모리: 가장 큰 단계의 세션당 증가량으로 나눈다. (세션이 많을수록 공유 비용이 덜 섞인다)
+    per_session = next(
+        (lv["rss_per_session"] for lv in sorted(levels, key=lambda lv: -lv["sessions"])
+         if lv["rss_per_session"] is not None and lv["rss_per_session"] > 0),
+        None,
+    )
+    estimate["rss_per_session"] = per_session
+    estimate["by_memory"] = int(memory_budget // per_session) if per_session and memory_budget else None
+
+    # 지연 시간: p95 목표를 지킨 가장 큰 세션 수 (모두 지켰다면 그보다 클 수 있음)
+    passing = [lv["sessions"] for lv in levels if lv["latency"]["p95"] is not None and lv["latency"]["p95"] <= slo_p95]
+    estimate["by_latency"] = max(passing) if passing else 0
+    estimate["by_latency_is_lower_bound"] = bool(passing) and max(passing) == max(lv["sessions"] for lv in levels)
+
+    # 처리량: 조작 없이 몰아친 최대 처리량 × 학생 한 명이 조작하는 간격
+    best = max((lv["throughput"] or 0) for lv in levels)
+    estimate["max_throughput"] = best
+    estimate["by_throughput"] = int(best * action_interval)
+
+    limits = [v for v in (estimate["by_memory"], estimate["by_throughput"]) if v is not None]
+    if not estimate["by_latency_is_lower_bound"]:
+        limits.append(estimate["by_latency"])
+    estimate["sessions"] = min(limits) if limits else None
+    return estimate
+
+
+def _ms(seconds):
+    return "-" if seconds is None else f"{seconds * 1000:,.0f}"
+
+
+def _mb(nbytes):
+    return "-" if nbytes is None else f"{nbytes / 1024**2:,.1f}"
+
+
+def print_level(level):
+    lat = level["latency"]
+    print(
+        f"세션 {level['sessions']:>4} | p50 {_ms(lat['p50']):>7} ms  p95 {_ms(lat['p95']):>7} ms  "
+        f"p99 {_ms(lat['p99']):>7} ms | {level['throughput'] or 0:7.2f} 건/초 | "
+        f"RSS {_mb(level['rss_before'])} → {_mb(level['rss_after'])} MB "
+        f"(세션당 {_mb(level['rss_per_session'])} MB) | 오류 {level['errors']}",
+        flush=True,
+    )
+    for name, s in level["by_action"].items():
+        print(f"    {name:<20} x{s['count']:<5} p50 {_ms(s['p50']):>7}  p95 {_ms(s['p95']):>7}  p99 {_ms(s['p99']):>7} ms")
+    for failure in level["failures"]:
+        print(f"    ! {failure}")
+
+
+def print_capacity(estimate):
+    print("\n용량 추정")
+    if estimate["by_memory"] is not None:
+        print(
+            f"  메모리   {estimate['by_memory']:>6,} 세션  "
+            f"(사용 가능 {_mb(estimate['memory_budget'])} MB / 세션당 {_mb(estimate['rss_per_session'])} MB)"
+        )
+    else:
+        print("  메모리        -   (세션당 RSS 증가량을 잴 수 없음)")
+    bound = " 이상" if estimate["by_latency_is_lower_bound"] else ""
+    print(f"  지연 시간 {estimate['by_latency']:>6,} 세션{bound}  (p95 ≤ {estimate['slo_p95'] * 1000:,.0f} ms)")
+    print(
+        f"  처리량   {estimate['by_throughput']:>6,} 세션  "
+        f"(최대 {estimate['max_throughput']:.2f} 건/초 × 조작 간격 {estimate['action_interval']:g}초)"
+    )
+    if estimate["sessions"] is not None:
+        print(f"  → 약 {estimate['sessions']:,} 세션")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--target", choices=("apptest", "server"), default="apptest")
+    parser.add_argument("--sessions", default=DEFAULT_SESSIONS, help="동시 세션 수 목록 (쉼표 구분)")
+    parser.add_argument("--mix", choices=MIXES, default="classroom")
+    parser.add_argument("--iterations", type=int, default=DEFAULT_ITERATIONS, help="세션마다 반복할 조작 횟수")
+    parser.add_argument("--n-trials", type=int, default=DEFAULT_N_TRIALS, help="시뮬레이터 시행 횟수")
+    parser.add_argument("--think-time", type=float, default=0.0, help="조작 사이 대기 시간(초)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--slo-p95", type=float, default=DEFAULT_SLO_P95, help="p95 지연 시간 목표(초)")
+    parser.add_argument("--action-interval", type=float, default=DEFAULT_ACTION_INTERVAL,
+                        help="학생 한 명이 조작하는 평균 간격(초), 처리량 기준 용량 추정에 사용")
+    parser.add_argument("--memory-budget-mb", type=float, default=None,
+                        help="세션에 쓸 수 있는 메모리(MB). 비우면 지금 사용 가능한 메모리")
+    parser.add_argument("--out", default=None, help="결과 JSON 경로")
+    args = parser.parse_args()
+
+    try:
+        levels_n = sorted({int(n) for n in args.sessions.split(",") if n.strip()})
+    except ValueError:
+        parser.error("--sessions는 쉼표로 구분한 정수 목록이어야 합니다.")
+    if not levels_n or min(levels_n) < 1:
+        parser.error("--sessions에는 1 이상인 수를 주세요.")
+
+    # AppTest가 스크립트 실행마다 남기는 경고 로그는 측정과 관계없으므로 끈다.
+    logging.disable(logging.WARNING)
+    memory_budget = (
+        args.memory_budget_mb * 1024**2 if args.memory_budget_mb is not None else available_memory()
+    )
+    run_level = run_level_apptest if args.target == "apptest" else run_level_server
+
+    print(f"대상 {args.target} · 묶음 {args.mix} · 세션마다 조작 {args.iterations}회", flush=True)
+    levels = []
+    for n in levels_n:
+        level = summarize_level(n, *run_level(n, args))
+        print_level(level)
+        levels.append(level)
+
+    estimate = estimate_capacity(levels, args.slo_p95, args.action_interval, memory_budget)
+    print_capacity(estimate)
+
+    if args.out:
+        report = {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "target": args.target,
+            "mix": args.mix,
+            "iterations": args.iterations,
+            "n_trials": args.n_trials,
+            "think_time": args.think_time,
+            "cpu_count": os.cpu_count(),
+            "levels": levels,
+            "capacity": estimate,
+        }
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"저장: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
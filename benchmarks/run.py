@@ -0,0 +1,399 @@
+"""시뮬레이터·데이터 로딩·구간화·그림 생성·앱 전체 재실행 시간을 여러 규모로 잰다.
+
+    python benchmarks/run.py                         # 전체 실행, 결과를 benchmarks/results/latest.json에 저장
+    python benchmarks/run.py --quick                 # 작은 규모만 (개발 중 빠른 확인)
+    python benchmarks/run.py --only sim,figures      # 일부 그룹만
+    python benchmarks/run.py --save-baseline         # 결과를 기준값(benchmarks/baseline.json)으로 저장
+    python benchmarks/run.py --compare               # 기준값과 비교, 느려진 항목이 있으면 종료 코드 1
+    python benchmarks/run.py compare OLD.json NEW.json --threshold 0.5
+
+그룹
+    sim      시행 횟수 10^3 ~ 10^8 의 동전/주사위 합/비트 압축 런 분석
+    data     원본 CSV(234행)를 행 복제로 수백만 행까지 늘린 합성 CSV의 첫 로딩(파싱+저장)과 재로딩(mmap)
+    bins     구간 코드 인덱스(pd.cut 대체)와 1년 단위 보간 프레임
+    figures  choropleth(px / 경량)·막대그래프 생성과 JSON 직렬화
+    app      Streamlit AppTest로 main.py 전체를 화면 없이 실행 (모드별 첫 실행 / 재실행 / 버튼·슬라이더 조작)
+
+각 항목은 여러 번 반복해 중앙값과 최솟값을 기록한다. 비교는 중앙값 비율로 하며,
+(새 값 / 기준값 - 1)이 threshold를 넘고 차이가 --min-delta 초 이상이면 회귀로 본다.
+"""
+import argparse
+import gc
+import json
+import logging
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from mathapp.figures import (  # noqa: E402
+    build_population_map,
+    build_population_map_lean,
+    build_top_n_bar,
+    figure_nbytes,
+)
+from mathapp.population import (  # noqa: E402
+    POP_CSV_PATH,
+    POP_YEARS,
+    build_aggregates,
+    build_annual_frame,
+    build_bin_index,
+    load_population_frame,
+)
+from mathapp.simulation import (  # noqa: E402
+    face_probabilities,
+    run_statistics,
+    simulate_counts_seeded,
+    simulate_packed_flips,
+    simulate_sum_counts_seeded,
+)
+
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+DEFAULT_OUT = os.path.join(RESULTS_DIR, "latest.json")
+DEFAULT_BASELINE = os.path.join(ROOT, "benchmarks", "baseline.json")
+# 기준값은 측정한 기계에 따라 달라서 저장소에 커밋하지 않는다. 비교 전에 같은 기계에서 만들어 둔다.
+MISSING_BASELINE_MESSAGE = (
+    "결과 파일이 없습니다: {path}\n"
+    "  기준값은 먼저 python benchmarks/run.py --save-baseline 으로 만들어 두세요."
+)
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_MIN_DELTA = 0.005
+GROUPS = ("sim", "data", "bins", "figures", "app")
+
+# 규모: 전체 / --quick
+SIM_TRIALS = [10**k for k in range(3, 9)]
+SIM_TRIALS_QUICK = [10**k for k in range(3, 7)]
+DATA_ROWS = [234, 10_000, 100_000, 1_000_000, 3_000_000]
+DATA_ROWS_QUICK = [234, 10_000, 100_000]
+# 지도 한 장에 수백만 개 도형을 넣는 일은 없으므로 그림은 10만 행까지만 잰다.
+FIGURE_ROWS_MAX = 100_000
+
+# 반복 횟수: 최소 1회, 최대 max_repeats회, 합계 target_seconds를 넘으면 멈춘다.
+TIMER_TARGET_SECONDS = 1.0
+TIMER_MAX_REPEATS = 7
+
+
+def measure(fn, setup=None, max_repeats=TIMER_MAX_REPEATS, target_seconds=TIMER_TARGET_SECONDS):
+    """fn()을 반복 실행해 {median, min, repeats} (초)를 돌려준다.
+
+    setup이 있으면 매 반복 전에 실행하고 그 시간은 재지 않는다. (캐시 비우기 등)
+    """
+    times = []
+    while len(times) < max_repeats and (not times or sum(times) < target_seconds):
+        if setup is not None:
+            setup()
+        gc.collect()
+        t = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t)
+    return {"median": statistics.median(times), "min": min(times), "repeats": len(times)}
+
+
+class Results(dict):
+    """항목 이름 -> 측정값. 값을 넣을 때마다 한 줄씩 출력한다. (오래 걸리는 실행의 진행 표시)"""
+
+    def __setitem__(self, name, timing):
+        super().__setitem__(name, timing)
+        print(
+            f"  {name:<45} {timing['median'] * 1000:>12,.2f} ms"
+            f"  (min {timing['min'] * 1000:,.2f}, x{timing['repeats']})",
+            flush=True,
+        )
+
+
+# =============================================================================
+# 합성 데이터 (원본 CSV 행 복제)
+# =============================================================================
+def scaled_csv(n_rows, out_dir, rng):
+    """원본 CSV를 n_rows행이 될 때까지 복제한 CSV를 만든다.
+
+    복제본의 국가 코드/이름에는 번호를 붙여 범주 수도 행 수에 맞춰 늘리고, 인구 열에는
+    ±20% 잡음을 곱해 구간 분포가 원본과 비슷하면서도 값이 모두 같지는 않게 한다.
+    """
+    path = os.path.join(out_dir, f"world_population_{n_rows}.csv")
+    if os.path.exists(path):
+        return path
+    base = pd.read_csv(POP_CSV_PATH)
+    if n_rows == len(base):
+        shutil.copyfile(POP_CSV_PATH, path)
+        return path
+
+    rows = np.arange(n_rows) % len(base)
+    copy_no = np.arange(n_rows) // len(base)
+    df = base.iloc[rows].reset_index(drop=True)
+    suffix = pd.Series(copy_no).map(lambda c: "" if c == 0 else f"-{c}")
+    df["CCA3"] = df["CCA3"] + suffix
+    df["Country/Territory"] = df["Country/Territory"] + suffix
+    df["Rank"] = np.arange(1, n_rows + 1)
+    for year in POP_YEARS:
+        col = f"{year} Population"
+        noise = np.where(copy_no == 0, 1.0, rng.uniform(0.8, 1.2, n_rows))
+        df[col] = np.rint(df[col].to_numpy() * noise).astype(np.int64)
+    df.to_csv(path, index=False)
+    return path
+
+
+# =============================================================================
+# 그룹별 항목
+# =============================================================================
+def bench_sim(quick):
+    results = Results()
+    probs = face_probabilities(6)
+    for n in SIM_TRIALS_QUICK if quick else SIM_TRIALS:
+        results[f"sim.coin[n={n}]"] = measure(lambda: simulate_counts_seeded(2, n, seed=0))
+        results[f"sim.dice-sum-10d6[n={n}]"] = measure(lambda: simulate_sum_counts_seeded(10, probs, n, seed=0))
+        results[f"sim.packed-runs[n={n}]"] = measure(
+            lambda: run_statistics(simulate_packed_flips(n, np.random.default_rng(0)), n)
+        )
+    return results
+
+
+def bench_data(quick, work_dir):
+    results = Results()
+    rng = np.random.default_rng(0)
+    for n in DATA_ROWS_QUICK if quick else DATA_ROWS:
+        csv_path = scaled_csv(n, work_dir, rng)
+        cache_dir = os.path.join(work_dir, f"cache_{n}")
+        # 첫 로딩: 저장소가 없는 상태에서 CSV 파싱 + 열 저장소 생성 + mmap 열기
+        results[f"data.load-cold[rows={n}]"] = measure(
+            lambda: load_population_frame(csv_path, cache_dir),
+            setup=lambda: shutil.rmtree(cache_dir, ignore_errors=True),
+            max_repeats=3,
+        )
+        # 재로딩: 새 프로세스가 이미 만들어진 저장소를 여는 경우
+        results[f"data.load-warm[rows={n}]"] = measure(lambda: load_population_frame(csv_path, cache_dir))
+    return results
+
+
+def _frames(quick, work_dir, max_rows=None):
+    # bins/figures 그룹이 같이 쓰는 (행 수, 스냅숏 프레임) 목록. 저장소는 한 번만 만든다.
+    rng = np.random.default_rng(0)
+    for n in DATA_ROWS_QUICK if quick else DATA_ROWS:
+        if max_rows is not None and n > max_rows:
+            continue
+        csv_path = scaled_csv(n, work_dir, rng)
+        yield n, load_population_frame(csv_path, os.path.join(work_dir, f"cache_{n}"))
+
+
+def bench_bins(quick, work_dir):
+    results = Results()
+    for n, df in _frames(quick, work_dir):
+        results[f"bins.bin-index[rows={n}]"] = measure(lambda: build_bin_index(df))
+        results[f"bins.aggregates[rows={n}]"] = measure(lambda: build_aggregates(df))
+        results[f"bins.annual-frame[rows={n}]"] = measure(lambda: build_annual_frame(df, POP_YEARS[-1]))
+        annual = build_annual_frame(df, POP_YEARS[-1])
+        results[f"bins.annual-bin-index[rows={n}]"] = measure(
+            lambda: build_bin_index(annual, annual.attrs["years"])
+        )
+    return results
+
+
+def bench_figures(quick, work_dir):
+    results = Results()
+    year = POP_YEARS[-1]
+    for n, df in _frames(quick, work_dir, FIGURE_ROWS_MAX):
+        index = build_bin_index(df)
+        aggregates = build_aggregates(df)
+        builders = {
+            "choropleth-px": lambda: build_population_map(df, index, year),
+            "choropleth-lean": lambda: build_population_map_lean(df, index, year),
+            "top-n-bar": lambda: build_top_n_bar(df, aggregates, year, 10),
+        }
+        for name, build in builders.items():
+            results[f"figures.{name}[rows={n}]"] = measure(build)
+            fig = build()
+            results[f"figures.{name}-json[rows={n}]"] = measure(lambda: figure_nbytes(fig))
+    return results
+
+
+def bench_app(quick):
+    """main.py 전체를 AppTest로 실행한다. 각 항목은 한 번의 스크립트 실행(run) 시간이다."""
+    from streamlit.testing.v1 import AppTest
+
+    # AppTest가 스크립트 실행마다 남기는 경고 로그는 시간 측정과 관계없으므로 끈다.
+    logging.disable(logging.WARNING)
+    main_path = os.path.join(ROOT, "main.py")
+    results = Results()
+
+    def fresh():
+        return AppTest.from_file(main_path, default_timeout=600)
+
+    def checked(target):
+        # target은 AppTest 또는 값을 바꾼 위젯. 위젯의 run()도 전체 스크립트를 다시 실행한다.
+        at = target.run()
+        if at.exception:
+            raise RuntimeError(f"앱 실행 중 예외: {at.exception[0].value}")
+        return at
+
+    # 계산기 (기본 화면)
+    results["app.calculator-first-run"] = measure(lambda: checked(fresh()), max_repeats=3)
+    at = checked(fresh())
+    results["app.calculator-rerun"] = measure(lambda: checked(at))
+    results["app.calculator-click"] = measure(lambda: checked(at.button[0].click()))
+
+    # 확률 시뮬레이터: 10만 회 동전 던지기 (시드를 비워 두어 매번 새로 계산)
+    at = checked(fresh())
+    at.sidebar.radio[0].set_value("확률 시뮬레이터")
+    results["app.simulator-switch"] = measure(lambda: checked(at), max_repeats=1)
+    results["app.simulator-rerun"] = measure(lambda: checked(at))
+    n_trials = 10_000 if quick else 100_000
+    at.number_input[0].set_value(n_trials)
+    results[f"app.simulator-run[n={n_trials}]"] = measure(lambda: checked(at.button[0].click()))
+
+    # 세계 인구: 첫 화면(데이터 로드 + 지도), 재실행, 연도 슬라이더 이동
+    # 새 세션이 계산기 화면을 띄운 뒤 세계 인구로 바꾸는 한 번의 실행 (같은 프로세스라 데이터 캐시는 공유)
+    pending = []
+    results["app.population-first-run"] = measure(
+        lambda: checked(pending.pop().sidebar.radio[0].set_value("연도별 세계인구 분석")),
+        setup=lambda: pending.append(checked(fresh())),
+        max_repeats=1 if quick else 3,
+    )
+    at = checked(fresh())
+    checked(at.sidebar.radio[0].set_value("연도별 세계인구 분석"))
+    results["app.population-rerun"] = measure(lambda: checked(at))
+    years = iter(at.select_slider[0].options * TIMER_MAX_REPEATS)
+    results["app.population-year-change"] = measure(
+        lambda: checked(at.select_slider[0].set_value(int(next(years))))
+    )
+    return results
+
+
+# =============================================================================
+# 결과 저장 / 비교
+# =============================================================================
+def environment():
+    import plotly
+    import streamlit
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "plotly": plotly.__version__,
+        "streamlit": streamlit.__version__,
+    }
+
+
+def run_benchmarks(groups, quick):
+    results = {}
+    work_dir = tempfile.mkdtemp(prefix="mathapp-bench-")
+    try:
+        for group in groups:
+            print(f"[{group}]", flush=True)
+            if group == "sim":
+                part = bench_sim(quick)
+            elif group == "data":
+                part = bench_data(quick, work_dir)
+            elif group == "bins":
+                part = bench_bins(quick, work_dir)
+            elif group == "figures":
+                part = bench_figures(quick, work_dir)
+            else:
+                part = bench_app(quick)
+            results.update(part)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "quick": quick,
+        "environment": environment(),
+        "results": results,
+    }
+
+
+def write_json(path, report):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"저장: {path}")
+
+
+def read_json(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD, min_delta=DEFAULT_MIN_DELTA):
+    """두 결과의 공통 항목을 중앙값으로 비교해 회귀 항목 이름 목록을 돌려준다."""
+    base, cur = baseline["results"], current["results"]
+    if baseline.get("environment") != current.get("environment"):
+        print("※ 기준값과 실행 환경(파이썬/라이브러리/CPU)이 다릅니다. 비교 결과는 참고용입니다.")
+
+    regressions = []
+    print(f"{'항목':<45} {'기준 ms':>12} {'현재 ms':>12} {'변화':>8}")
+    for name in sorted(base.keys() & cur.keys()):
+        old, new = base[name]["median"], cur[name]["median"]
+        change = new / old - 1 if old > 0 else 0.0
+        regressed = change > threshold and new - old >= min_delta
+        mark = "  ← 느려짐" if regressed else ""
+        print(f"{name:<45} {old * 1000:>12,.2f} {new * 1000:>12,.2f} {change:>+8.1%}{mark}")
+        if regressed:
+            regressions.append(name)
+
+    missing = sorted(base.keys() - cur.keys())
+    if missing:
+        print(f"이번 실행에 없는 기준 항목 {len(missing)}개: {', '.join(missing[:5])}{' …' if len(missing) > 5 else ''}")
+    if regressions:
+        print(f"회귀 {len(regressions)}개 (기준 대비 +{threshold:.0%} 초과, {min_delta * 1000:g} ms 이상)")
+    else:
+        print("회귀 없음")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command")
+    cmp_parser = sub.add_parser("compare", help="저장된 결과 파일 두 개를 비교")
+    cmp_parser.add_argument("baseline")
+    cmp_parser.add_argument("current")
+    for p in (parser, cmp_parser):
+        p.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                       help="허용하는 느려짐 비율 (0.25 = 25%%)")
+        p.add_argument("--min-delta", type=float, default=DEFAULT_MIN_DELTA,
+                       help="이보다 작은 차이(초)는 회귀로 보지 않음")
+    parser.add_argument("--only", default=",".join(GROUPS), help=f"실행할 그룹 ({','.join(GROUPS)})")
+    parser.add_argument("--quick", action="store_true", help="작은 규모만 실행")
+    parser.add_argument("--out", default=DEFAULT_OUT)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="결과를 --baseline 경로에도 저장")
+    parser.add_argument("--compare", action="store_true", help="실행 후 --baseline과 비교")
+    args = parser.parse_args()
+
+    if args.command == "compare":
+        for path in (args.baseline, args.current):
+            if not os.path.exists(path):
+                parser.error(MISSING_BASELINE_MESSAGE.format(path=path))
+        regressions = compare(read_json(args.baseline), read_json(args.current), args.threshold, args.min_delta)
+        sys.exit(1 if regressions else 0)
+
+    groups = [g.strip() for g in args.only.split(",") if g.strip()]
+    unknown = [g for g in groups if g not in GROUPS]
+    if unknown:
+        parser.error(f"알 수 없는 그룹: {', '.join(unknown)}")
+    # 측정을 다 돌린 뒤에 실패하지 않도록 기준값 파일은 미리 확인한다.
+    if args.compare and not args.save_baseline and not os.path.exists(args.baseline):
+        parser.error(MISSING_BASELINE_MESSAGE.format(path=args.baseline))
+
+    report = run_benchmarks(groups, args.quick)
+    write_json(args.out, report)
+    if args.save_baseline:
+        write_json(args.baseline, report)
+    if args.compare:
+        regressions = compare(read_json(args.baseline), report, args.threshold, args.min_delta)
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
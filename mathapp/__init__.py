@@ -0,0 +1,5 @@
+"""다기능 수학 웹앱의 계산/시뮬레이션/데이터 처리 모듈.
+
+Streamlit 없이도 import할 수 있다. (calculator, number_theory, simulation, population, figures)
+화면 코드는 mathapp.ui 아래에 있고, main.py가 선택된 앱의 화면 모듈만 불러온다.
+"""
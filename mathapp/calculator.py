@@ -0,0 +1,364 @@
+import ast
+import functools
+import io
+import math
+import re
+
+import numpy as np
+
+# pandas는 표를 다루는 일괄/수식 계산 함수 안에서만 불러온다. (사칙연산만 쓰는 화면의 첫 로딩을 가볍게)
+
+# =============================================================================
+# 일괄 계산 (피연산자 표 전체를 NumPy로 한 번에 계산)
+# =============================================================================
+# 연산 이름 -> (필요한 피연산자 열 수, 내부 연산 키)
+BATCH_OPERATIONS = {
+    "더하기 (a + b)": (2, "add"),
+    "빼기 (a - b)": (2, "sub"),
+    "곱하기 (a × b)": (2, "mul"),
+    "나누기 (a ÷ b)": (2, "div"),
+    "모듈러 (a mod n)": (2, "mod"),
+    "지수 (a ^ b)": (2, "pow"),
+    "상용로그 (log₁₀ x)": (1, "log10"),
+    "자연로그 (ln x)": (1, "ln"),
+    "임의의 밑 로그 (log_b x)": (2, "logb"),
+}
+
+# 원소별 오류 코드. 예외 대신 코드 배열로 표시하고 해당 결과는 NaN으로 둔다.
+ERR_OK = 0
+ERR_DIV_ZERO = 1
+ERR_X_NONPOSITIVE = 2
+ERR_INVALID_BASE = 3
+ERR_OVERFLOW = 4
+ERR_INVALID_INPUT = 5
+
+# 단일 계산 모드의 디스플레이 문구와 같은 표기
+ERROR_MESSAGES = {
+    ERR_OK: "",
+    ERR_DIV_ZERO: "Error: divide by 0",
+    ERR_X_NONPOSITIVE: "Error: x ≤ 0",
+    ERR_INVALID_BASE: "Error: invalid base",
+    ERR_OVERFLOW: "Error: overflow",
+    ERR_INVALID_INPUT: "Error: invalid input",
+}
+
+# 결과 CSV를 만들 때 한 번에 직렬화하는 행 수
+BATCH_CSV_CHUNK_ROWS = 200_000
+# 화면에 미리 보여 줄 행 수
+BATCH_PREVIEW_ROWS = 1000
+
+
+def _mark(errors, mask, code):
+    # 아직 오류가 없는 원소에만 코드를 기록한다. (먼저 발견한 오류가 우선)
+    errors[mask & (errors == ERR_OK)] = code
+
+
+def apply_operation(key, a, b, errors):
+    """연산 하나를 배열 전체에 적용한다. 새로 발견한 오류는 errors에 기록한다.
+
+    일괄 계산과 수식 계산이 같은 오류 기준을 쓰도록 두 곳 모두 이 함수를 거친다.
+    """
+    with np.errstate(all="ignore"):
+        if key == "add":
+            result = a + b
+        elif key == "sub":
+            result = a - b
+        elif key == "mul":
+            result = a * b
+        elif key == "div":
+            _mark(errors, b == 0, ERR_DIV_ZERO)
+            result = a / b
+        elif key == "mod":
+            # 파이썬의 % 규칙(결과 부호가 n을 따름)과 같은 np.mod
+            _mark(errors, b == 0, ERR_DIV_ZERO)
+            result = np.mod(a, b)
+        elif key == "pow":
+            _mark(errors, (a == 0) & (b < 0), ERR_DIV_ZERO)
+            result = np.power(a, b)
+            # 음수 밑 + 정수가 아닌 지수처럼 실수 결과가 없는 경우
+            _mark(errors, np.isnan(result) & ~np.isnan(a) & ~np.isnan(b), ERR_INVALID_INPUT)
+        elif key == "log10":
+            _mark(errors, a <= 0, ERR_X_NONPOSITIVE)
+            result = np.log10(a)
+        elif key == "ln":
+            _mark(errors, a <= 0, ERR_X_NONPOSITIVE)
+            result = np.log(a)
+        elif key == "logb":
+            _mark(errors, a <= 0, ERR_X_NONPOSITIVE)
+            _mark(errors, (b <= 0) | (b == 1), ERR_INVALID_BASE)
+            result = np.log(a) / np.log(b)
+        else:
+            raise ValueError(f"알 수 없는 연산: {key}")
+
+        # 유한한 입력에서 무한대가 나오면 범위 초과
+        finite_inputs = np.isfinite(a) & np.isfinite(b)
+        _mark(errors, np.isinf(result) & finite_inputs, ERR_OVERFLOW)
+    return result
+
+
+def evaluate_batch(op, a, b=None):
+    """피연산자 배열 전체에 연산을 적용해 (결과, 오류 코드) 배열을 돌려준다.
+
+    파이썬 반복문이나 예외 없이 NumPy 연산과 마스크만 쓴다. 숫자가 아닌 입력(NaN)은
+    ERR_INVALID_INPUT, 나머지 오류는 단일 계산 모드와 같은 기준으로 표시한다.
+    """
+    n_operands, key = BATCH_OPERATIONS[op]
+    a = np.asarray(a, dtype=np.float64)
+    b = np.zeros_like(a) if b is None else np.asarray(b, dtype=np.float64)
+
+    errors = np.zeros(a.shape, dtype=np.int8)
+    invalid = np.isnan(a)
+    if n_operands == 2:
+        invalid |= np.isnan(b)
+    _mark(errors, invalid, ERR_INVALID_INPUT)
+
+    result = apply_operation(key, a, b, errors)
+    result[errors != ERR_OK] = np.nan
+    return result, errors
+
+
+def _is_number(token):
+    try:
+        float(token)
+    except ValueError:
+        return False
+    return True
+
+
+class OperandError(ValueError):
+    """피연산자 표로 읽을 수 없는 입력. 메시지는 화면에 그대로 보여 줄 수 있는 문구다."""
+
+
+def parse_operands(text):
+    """붙여 넣은 텍스트나 올린 CSV 파일 내용(bytes)을 피연산자 표로 읽는다. (한 줄에 'a' 또는 'a,b')
+
+    첫 줄의 칸이 모두 숫자가 아니면 머리글(열 이름)로, 하나라도 숫자면 데이터로 본다.
+    입력 방식과 관계없이 같은 규칙이라 같은 내용이면 같은 표가 된다. 숫자로 읽을 수 없는
+    칸은 NaN이 되어 evaluate_batch에서 ERR_INVALID_INPUT으로 표시된다. 비어 있거나,
+    UTF-8이 아니거나, 줄마다 칸 수가 달라 표로 읽을 수 없으면 OperandError.
+    """
+    # 쉼표가 보이면 CSV, 아니면 공백/탭 구분. (둘 다 pandas C 파서로 읽힌다)
+    import pandas as pd
+
+    if isinstance(text, bytes):
+        try:
+            text = text.decode("utf-8-sig")
+        except UnicodeDecodeError:
+            raise OperandError("UTF-8 형식의 CSV 파일만 읽을 수 있습니다.") from None
+
+    sep = "," if "," in text[:4096] else r"\s+"
+    first_line = text.lstrip().split("\n", 1)[0]
+    tokens = [t.strip() for t in (first_line.split(",") if sep == "," else first_line.split())]
+    header = 0 if tokens and not any(_is_number(t) for t in tokens if t) else None
+    try:
+        df = pd.read_csv(io.StringIO(text), header=header, sep=sep, skip_blank_lines=True)
+    except pd.errors.EmptyDataError:
+        raise OperandError("입력에 피연산자가 없습니다.") from None
+    except pd.errors.ParserError:
+        raise OperandError("줄마다 값의 개수가 같아야 합니다. (한 줄에 'a' 또는 'a,b')") from None
+    return df.apply(pd.to_numeric, errors="coerce")
+
+
+def operand_column(df, col):
+    import pandas as pd
+
+    return pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=np.float64)
+
+
+def error_summary(errors):
+    # 오류 코드별 개수 (0개인 코드는 뺀다)
+    counts = np.bincount(errors, minlength=len(ERROR_MESSAGES))
+    return {ERROR_MESSAGES[code]: int(n) for code, n in enumerate(counts) if code != ERR_OK and n}
+
+
+def batch_frame(a, b, result, errors):
+    import pandas as pd
+
+    data = {"a": a}
+    if b is not None:
+        data["b"] = b
+    data["result"] = result
+    data["error"] = pd.Categorical.from_codes(errors, categories=list(ERROR_MESSAGES.values()))
+    return pd.DataFrame(data)
+
+
+def iter_batch_csv(a, b, result, errors, chunk_rows=BATCH_CSV_CHUNK_ROWS):
+    """결과 표를 chunk_rows 행씩 CSV bytes로 만들어 차례로 내보낸다. (헤더는 첫 조각에만)"""
+    n = len(result)
+    for start in range(0, max(n, 1), chunk_rows):
+        stop = min(start + chunk_rows, n)
+        chunk = batch_frame(
+            a[start:stop],
+            None if b is None else b[start:stop],
+            result[start:stop],
+            errors[start:stop],
+        )
+        yield chunk.to_csv(index=False, header=(start == 0)).encode("utf-8")
+
+
+# =============================================================================
+# 수식 계산 (한 번 파싱해 컴파일한 함수를 재사용)
+# =============================================================================
+# 수식은 파이썬 ast로 파싱하되, 아래 목록에 있는 노드만 허용해 NumPy 연산 클로저로 바꾼다.
+# eval/compile은 쓰지 않으므로 속성 접근, 임의 함수 호출 같은 코드는 실행될 수 없다.
+EXPR_MAX_LENGTH = 1000
+EXPR_CACHE_SIZE = 256
+
+# 화면 표기 -> 파이썬 문법 (mod, ^, ×, ÷, 유니코드 빼기)
+_EXPR_REPLACEMENTS = [
+    (re.compile(r"\bmod\b"), "%"),
+    (re.compile(r"\^"), "**"),
+    (re.compile("×"), "*"),
+    (re.compile("÷"), "/"),
+    (re.compile("−"), "-"),
+]
+
+_EXPR_BINOPS = {
+    ast.Add: "add",
+    ast.Sub: "sub",
+    ast.Mult: "mul",
+    ast.Div: "div",
+    ast.Mod: "mod",
+    ast.Pow: "pow",
+}
+
+_EXPR_CONSTANTS = {"pi": math.pi, "e": math.e}
+
+# log_2(x), log_10(x) 처럼 밑을 이름에 붙여 쓰는 형태
+_LOG_BASE_NAME = re.compile(r"^log_(\d+)$")
+
+
+class ExpressionError(ValueError):
+    """허용되지 않는 수식. 메시지는 화면에 그대로 보여 줄 수 있는 문구다."""
+
+
+def _compile_node(node, variables):
+    # 노드 하나를 env(변수 이름 -> 배열)를 받아 (값, 오류 코드)를 돌려주는 함수로 바꾼다.
+    if isinstance(node, ast.Constant):
+        if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+            raise ExpressionError(f"숫자가 아닌 값은 쓸 수 없습니다: {node.value!r}")
+        # float 범위를 넘는 정수(수백 자리)와 1e999 같은 무한대 리터럴은 연산 결과의
+        # 오버플로와 똑같이 ERR_OVERFLOW로 표시한다.
+        try:
+            value = np.float64(node.value)
+        except OverflowError:
+            value = np.float64(np.inf)
+        if not np.isfinite(value):
+            def overflow(env, errors):
+                _mark(errors, True, ERR_OVERFLOW)
+                return value
+            return overflow
+        return lambda env, errors: value
+
+    if isinstance(node, ast.Name):
+        name = node.id
+        if name in _EXPR_CONSTANTS:
+            value = np.float64(_EXPR_CONSTANTS[name])
+            return lambda env, errors: value
+        variables.add(name)
+
+        def load(env, errors):
+            values = env[name]
+            _mark(errors, np.isnan(values), ERR_INVALID_INPUT)
+            return values
+        return load
+
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+        operand = _compile_node(node.operand, variables)
+        if isinstance(node.op, ast.UAdd):
+            return operand
+        return lambda env, errors: -operand(env, errors)
+
+    if isinstance(node, ast.BinOp) and type(node.op) in _EXPR_BINOPS:
+        key = _EXPR_BINOPS[type(node.op)]
+        left = _compile_node(node.left, variables)
+        right = _compile_node(node.right, variables)
+        return lambda env, errors: apply_operation(key, left(env, errors), right(env, errors), errors)
+
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and not node.keywords:
+        name = node.func.id
+        base_match = _LOG_BASE_NAME.match(name)
+        if name not in ("ln", "log") and not base_match:
+            raise ExpressionError(f"지원하지 않는 함수입니다: {name}")
+        args = [_compile_node(arg, variables) for arg in node.args]
+        if name == "ln" and len(args) == 1:
+            key, base = "ln", None
+        elif name == "log" and len(args) == 1:
+            key, base = "log10", None
+        elif name == "log" and len(args) == 2:
+            # log(x, b): 밑이 b인 로그
+            key, base = "logb", args[1]
+        elif base_match and len(args) == 1:
+            const = np.float64(int(base_match.group(1)))
+            key, base = "logb", (lambda env, errors: const)
+        else:
+            raise ExpressionError(f"지원하지 않는 함수 호출입니다: {name}(인자 {len(args)}개)")
+
+        x = args[0]
+        if base is None:
+            return lambda env, errors: apply_operation(key, x(env, errors), 0.0, errors)
+        return lambda env, errors: apply_operation(key, x(env, errors), base(env, errors), errors)
+
+    raise ExpressionError(f"허용되지 않는 식입니다: {type(node).__name__}")
+
+
+@functools.lru_cache(maxsize=EXPR_CACHE_SIZE)
+def compile_expression(text):
+    """수식 문자열을 한 번만 파싱해 CompiledExpression으로 만든다. (수식 문자열별로 캐시)
+
+    허용: 숫자, 변수, pi, e, + - × ÷ mod ^, log(x), ln(x), log(x, b), log_2(x) 같은 log_b(x).
+    문법 오류나 허용되지 않는 구문은 ExpressionError로 알린다.
+    """
+    if len(text) > EXPR_MAX_LENGTH:
+        raise ExpressionError(f"수식이 너무 깁니다. (최대 {EXPR_MAX_LENGTH}자)")
+    source = text.strip()
+    if not source:
+        raise ExpressionError("수식을 입력하세요.")
+    for pattern, repl in _EXPR_REPLACEMENTS:
+        source = pattern.sub(repl, source)
+
+    try:
+        tree = ast.parse(source, mode="eval")
+        variables = set()
+        fn = _compile_node(tree.body, variables)
+    except SyntaxError:
+        raise ExpressionError("수식 문법이 올바르지 않습니다.") from None
+    except RecursionError:
+        raise ExpressionError("수식의 괄호/연산 중첩이 너무 깊습니다.") from None
+    return CompiledExpression(text, tuple(sorted(variables)), fn)
+
+
+def parse_values(text):
+    # 쉼표/공백으로 구분한 값 목록을 float 배열로 읽는다. 숫자가 아닌 값은 NaN.
+    import pandas as pd
+
+    tokens = [t for t in re.split(r"[,\s]+", text.strip()) if t]
+    return pd.to_numeric(pd.Series(tokens, dtype=object), errors="coerce").to_numpy(dtype=np.float64)
+
+
+class CompiledExpression:
+    """컴파일된 수식. 같은 수식을 여러 값으로 반복 계산할 때 파싱 비용이 들지 않는다."""
+
+    def __init__(self, text, variables, fn):
+        self.text = text
+        self.variables = variables
+        self._fn = fn
+
+    def evaluate(self, **bindings):
+        """변수 값(스칼라 또는 같은 길이의 배열)을 받아 (결과, 오류 코드) 배열을 돌려준다.
+
+        오류 기준은 evaluate_batch와 같고, 오류가 난 원소의 결과는 NaN이다.
+        """
+        missing = [name for name in self.variables if name not in bindings]
+        if missing:
+            raise ExpressionError(f"값이 없는 변수: {', '.join(missing)}")
+        env = {name: np.asarray(bindings[name], dtype=np.float64) for name in self.variables}
+        try:
+            shape = np.broadcast_shapes(*(v.shape for v in env.values())) if env else ()
+        except ValueError:
+            raise ExpressionError("변수 값들의 길이가 서로 다릅니다.") from None
+
+        errors = np.zeros(shape, dtype=np.int8)
+        result = np.array(np.broadcast_to(self._fn(env, errors), shape), dtype=np.float64)
+        result[errors != ERR_OK] = np.nan
+        return result, errors
@@ -0,0 +1,558 @@
+import functools
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from .population import (
+    APP_ROOT,
+    PCT_BIN_LABELS,
+    PCT_BINS,
+    PCT_COL,
+    POP_BIN_LABELS,
+    POP_BINS,
+    POP_YEARS,
+    biggest_movers,
+    binned,
+    continent_rollup,
+    top_n,
+)
+
+# =============================================================================
+# 세계 인구 지도 (choropleth) 생성 + 프로세스 전역 LRU 캐시
+# =============================================================================
+# 캐시에 담을 그림들의 직렬화 크기 합계 상한 (bytes)
+FIGURE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# 앱에 함께 두는 세계 지도 topojson. (Streamlit 정적 파일로 /app/static/topojson/ 에서 제공)
+# 파일이 있으면 브라우저가 Plotly CDN 대신 여기서 받아 가므로 인터넷이 없는 곳에서도 지도가 그려진다.
+# tools/fetch_world_topojson.py 로 한 번 받아 둔다.
+LOCAL_TOPOJSON_DIR = os.path.join(APP_ROOT, "static", "topojson")
+LOCAL_TOPOJSON_URL = "./app/static/topojson/"
+WORLD_TOPOJSON_FILE = "world_110m.json"
+
+
+def figure_nbytes(fig):
+    # 브라우저로 보내는 JSON 크기를 그림 크기로 본다.
+    return len(pio.to_json(fig, validate=False).encode("utf-8"))
+
+
+class FigureCache:
+    """(데이터 버전, 그림 종류, 열, 구간 정의) 키로 그림을 보관하는 스레드 안전 LRU 캐시.
+
+    직렬화 크기 합계가 max_bytes를 넘으면 가장 오래 쓰지 않은 그림부터 버린다.
+    같은 키를 여러 스레드가 동시에 요청하면 하나만 만들고 나머지는 기다렸다가 결과를 받는다.
+    """
+
+    def __init__(self, max_bytes=FIGURE_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (fig, nbytes)
+        self._building = {}            # key -> threading.Event
+        self._lock = threading.Lock()
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def get_or_build(self, key, build):
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[0]
+                event = self._building.get(key)
+                if event is None:
+                    event = self._building[key] = threading.Event()
+                    self.misses += 1
+                    break
+            # 다른 스레드가 같은 그림을 만드는 중이면 끝날 때까지 기다렸다가 다시 찾는다.
+            event.wait()
+
+        try:
+            fig = build()
+            self._put(key, fig, figure_nbytes(fig))
+        finally:
+            with self._lock:
+                del self._building[key]
+            event.set()
+        return fig
+
+    def _put(self, key, fig, nbytes):
+        with self._lock:
+            if nbytes > self.max_bytes:
+                return
+            self._entries[key] = (fig, nbytes)
+            self.total_bytes += nbytes
+            while self.total_bytes > self.max_bytes:
+                _, (_, evicted_bytes) = self._entries.popitem(last=False)
+                self.total_bytes -= evicted_bytes
+
+    def nbytes_of(self, fig):
+        # 캐시에 들어 있는 그림이면 저장할 때 잰 직렬화 크기를 돌려준다.
+        with self._lock:
+            for cached_fig, nbytes in self._entries.values():
+                if cached_fig is fig:
+                    return nbytes
+        return None
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.total_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+FIGURE_CACHE = FigureCache()
+
+
+def payload_nbytes(fig, cache=FIGURE_CACHE):
+    # 그림을 브라우저로 보낼 때의 직렬화 크기 (캐시에 있으면 다시 직렬화하지 않음)
+    nbytes = cache.nbytes_of(fig)
+    return figure_nbytes(fig) if nbytes is None else nbytes
+
+
+def plotly_config():
+    # st.plotly_chart(config=...)에 넘길 설정. 로컬 topojson이 있으면 그쪽을 쓰게 한다.
+    # 파일이 없으면(저장소에는 커밋하지 않음) 빈 설정을 돌려 Plotly 기본값인 CDN
+    # (https://cdn.plot.ly/un/)에서 지도를 받게 둔다. 파일은 tools/fetch_world_topojson.py로 만든다.
+    if os.path.exists(os.path.join(LOCAL_TOPOJSON_DIR, WORLD_TOPOJSON_FILE)):
+        return {"topojsonURL": LOCAL_TOPOJSON_URL}
+    return {}
+
+
+# -----------------------------------
+# 그림 생성 함수
+# -----------------------------------
+def _discrete_colorscale(colors):
+    # 정수 코드 0..n-1을 각 색으로 칠하는 계단형 colorscale
+    n = len(colors)
+    scale = []
+    for i, color in enumerate(colors):
+        scale.append([i / n, color])
+        scale.append([(i + 1) / n, color])
+    return scale
+
+
+def _categorical_colors(n):
+    # px.choropleth와 같은 색을 쓰도록 현재 기본 템플릿의 colorway를 따른다.
+    # (Streamlit 템플릿의 자리표시 색은 브라우저에서 테마 색으로 바뀐다)
+    colorway = pio.templates[pio.templates.default].layout.colorway or px.colors.qualitative.Plotly
+    return list(colorway)[:n]
+
+
+def _coded_choropleth(df_pop, codes, labels, hover_values, hover_label, hover_format,
+                      legend_title):
+    """구간 코드(z) 하나로 칠하는 단일 trace choropleth.
+
+    px.choropleth는 구간마다 trace를 나누고 trace마다 hovertemplate/colorscale을 반복하지만,
+    여기서는 국가 코드·이름·값을 한 번씩만 담는다. 범위 밖 코드(-1)는 칠하지 않는다.
+    """
+    z = np.asarray(codes).astype(np.float32)
+    z[z < 0] = np.nan
+    return go.Choropleth(
+        locations=df_pop["CCA3"].astype(str).to_numpy(),
+        text=df_pop["Country/Territory"].astype(str).to_numpy(),
+        z=z,
+        customdata=hover_values,
+        zmin=-0.5,
+        zmax=len(labels) - 0.5,
+        colorscale=_discrete_colorscale(_categorical_colors(len(labels))),
+        colorbar=dict(
+            title=legend_title,
+            tickvals=list(range(len(labels))),
+            ticktext=labels,
+        ),
+        hovertemplate=f"<b>%{{text}}</b><br>{hover_label}: %{{customdata:{hover_format}}}<extra></extra>",
+    )
+
+
+def build_population_map(df_pop, bin_index, year):
+    pop_col = f"{year} Population"
+    # 전체 프레임을 복사하지 않고 지도에 필요한 열만 골라 구간 열을 붙인다.
+    df_map = df_pop[["CCA3", "Country/Territory", pop_col]].assign(**{
+        "Population Range": binned(bin_index, pop_col)
+    })
+
+    fig_pop = px.choropleth(
+        df_map,
+        locations="CCA3",               # 3자리 국가 코드
+        color="Population Range",
+        hover_name="Country/Territory",
+        hover_data={pop_col: ":,"},
+        category_orders={"Population Range": POP_BIN_LABELS},
+        title=f"{year}년 세계 인구 (구간별 인구수)"
+    )
+    fig_pop.update_layout(
+        legend_title_text="인구수 구간",
+    )
+    return fig_pop
+
+
+def build_share_map(df_pop, bin_index):
+    df_pct = df_pop[["CCA3", "Country/Territory", PCT_COL]].assign(**{
+        "World Pop Share Range": binned(bin_index, PCT_COL)
+    })
+
+    fig_pct = px.choropleth(
+        df_pct,
+        locations="CCA3",
+        color="World Pop Share Range",
+        hover_name="Country/Territory",
+        hover_data={PCT_COL: ":.2f"},
+        category_orders={"World Pop Share Range": PCT_BIN_LABELS},
+        title="세계 인구에서 각 국가가 차지하는 비율(%) 구간"
+    )
+    fig_pct.update_layout(
+        legend_title_text="세계 인구 비율 구간"
+    )
+    return fig_pct
+
+
+# -----------------------------------
+# 경량 그림 (전송량 최소화)
+# -----------------------------------
+# 필요한 열(국가 코드, 이름, 구간 코드, 호버 값)만 담고 호버 값은 표시 자릿수로 반올림한다.
+# 줄어드는 양은 크지 않다 (2022년 인구 지도 약 6%, 비율 지도 약 11%).
+def build_population_map_lean(df_pop, bin_index, year):
+    pop_col = f"{year} Population"
+    fig = go.Figure(_coded_choropleth(
+        df_pop,
+        bin_index["codes"][:, bin_index["position"][pop_col]],
+        POP_BIN_LABELS,
+        df_pop[pop_col].to_numpy(),
+        "인구",
+        ",",
+        "인구수 구간",
+    ))
+    fig.update_layout(title=f"{year}년 세계 인구 (구간별 인구수)")
+    return fig
+
+
+def build_share_map_lean(df_pop, bin_index):
+    fig = go.Figure(_coded_choropleth(
+        df_pop,
+        bin_index["codes"][:, bin_index["position"][PCT_COL]],
+        PCT_BIN_LABELS,
+        np.round(df_pop[PCT_COL].to_numpy(), 2),
+        "세계 인구 비율(%)",
+        ".2f",
+        "세계 인구 비율 구간",
+    ))
+    fig.update_layout(title="세계 인구에서 각 국가가 차지하는 비율(%) 구간")
+    return fig
+
+
+# -----------------------------------
+# 캐시를 거치는 조회 함수
+# -----------------------------------
+def figure_version(df_pop, year=None):
+    """그림 캐시 키에 쓰는 데이터 버전.
+
+    1년 단위 프레임에서 마지막 스냅숏 연도까지의 값(과 비율 열)은 투영할 마지막 연도와 무관하므로,
+    그 그림은 horizon이 빠진 attrs["observed_version"]으로 묶어 모든 horizon이 함께 쓴다.
+    year를 주지 않으면 연도와 무관한 그림(비율 지도)으로 본다.
+    """
+    observed = df_pop.attrs.get("observed_version")
+    if observed is not None and (year is None or year <= df_pop.attrs["last_observed_year"]):
+        return observed
+    return df_pop.attrs.get("version")
+
+
+def population_map_key(df_pop, year, lean=False):
+    return (
+        figure_version(df_pop, year), "population-lean" if lean else "population",
+        f"{year} Population", tuple(POP_BINS), tuple(POP_BIN_LABELS),
+    )
+
+
+def share_map_key(df_pop, lean=False):
+    return (
+        figure_version(df_pop), "share-lean" if lean else "share",
+        PCT_COL, tuple(PCT_BINS), tuple(PCT_BIN_LABELS),
+    )
+
+
+def get_population_map(df_pop, bin_index, year, lean=False, cache=FIGURE_CACHE):
+    build = build_population_map_lean if lean else build_population_map
+    return cache.get_or_build(
+        population_map_key(df_pop, year, lean),
+        lambda: build(df_pop, bin_index, year),
+    )
+
+
+def get_share_map(df_pop, bin_index, lean=False, cache=FIGURE_CACHE):
+    build = build_share_map_lean if lean else build_share_map
+    return cache.get_or_build(
+        share_map_key(df_pop, lean),
+        lambda: build(df_pop, bin_index),
+    )
+
+
+# -----------------------------------
+# 연도 애니메이션 지도 (브라우저에서 연도 전환)
+# -----------------------------------
+def build_population_animation(df_pop, bin_index, years=None):
+    """모든 연도를 Plotly 애니메이션 프레임으로 담은 인구 구간 지도.
+
+    구간을 범주별 trace로 나누지 않고 하나의 trace에 정수 코드(z)로 칠한다. 국가 코드와 이름은
+    기본 trace에 한 번만 넣고, 각 프레임에는 연도마다 바뀌는 z(구간 코드)와 customdata(인구수)만
+    담아 프레임 데이터를 최소화한다. 연도 전환은 브라우저에서만 일어나므로 서버는 일하지 않는다.
+    """
+    years = [y for y in (POP_YEARS if years is None else years) if f"{y} Population" in df_pop.columns]
+
+    def frame_values(year):
+        col = f"{year} Population"
+        codes = bin_index["codes"][:, bin_index["position"][col]].astype(np.float32)
+        codes[codes < 0] = np.nan
+        return codes, df_pop[col].to_numpy()
+
+    def title(year):
+        return f"{year}년 세계 인구 (구간별 인구수)"
+
+    frames = []
+    for year in years:
+        z, pop = frame_values(year)
+        frames.append(go.Frame(
+            name=str(year),
+            data=[go.Choropleth(z=z, customdata=pop)],
+            traces=[0],
+            layout=dict(title_text=title(year)),
+        ))
+
+    last = years[-1]
+    z_last, pop_last = frame_values(last)
+    fig = go.Figure(
+        data=[_coded_choropleth(
+            df_pop, z_last, POP_BIN_LABELS, pop_last, "인구", ",", "인구수 구간"
+        )],
+        frames=frames,
+    )
+
+    frame_args = {"frame": {"duration": 0, "redraw": True}, "mode": "immediate"}
+    fig.update_layout(
+        title=title(last),
+        sliders=[dict(
+            active=len(years) - 1,
+            currentvalue={"prefix": "연도: "},
+            steps=[
+                dict(label=str(year), method="animate", args=[[str(year)], frame_args])
+                for year in years
+            ],
+        )],
+        updatemenus=[dict(
+            type="buttons",
+            direction="left",
+            x=0.0,
+            y=0.0,
+            xanchor="right",
+            yanchor="top",
+            buttons=[
+                dict(
+                    label="▶",
+                    method="animate",
+                    args=[None, {"frame": {"duration": 700, "redraw": True}, "fromcurrent": True}],
+                ),
+                dict(
+                    label="❚❚",
+                    method="animate",
+                    args=[[None], {"frame": {"duration": 0, "redraw": False}, "mode": "immediate"}],
+                ),
+            ],
+        )],
+    )
+    return fig
+
+
+def population_animation_key(df_pop, years=None):
+    years = POP_YEARS if years is None else years
+    return (
+        df_pop.attrs.get("version"), "animation", tuple(years),
+        tuple(POP_BINS), tuple(POP_BIN_LABELS),
+    )
+
+
+def get_population_animation(df_pop, bin_index, years=None, cache=FIGURE_CACHE):
+    return cache.get_or_build(
+        population_animation_key(df_pop, years),
+        lambda: build_population_animation(df_pop, bin_index, years),
+    )
+
+
+# -----------------------------------
+# 대륙 합계 / 상위 국가 / 변화량 차트 (집계 인덱스에서 바로 잘라 그림)
+# -----------------------------------
+def build_continent_area(aggregates):
+    sums = continent_rollup(aggregates)
+    years = aggregates["years"]
+    fig = go.Figure([
+        go.Scatter(x=years, y=sums[i], name=continent, mode="lines", stackgroup="continent")
+        for i, continent in enumerate(aggregates["continents"])
+    ])
+    fig.update_layout(
+        title="대륙별 인구 합계",
+        xaxis_title="연도",
+        yaxis_title="인구",
+        hovermode="x unified",
+    )
+    return fig
+
+
+def build_top_n_bar(df_pop, aggregates, year, n):
+    rows, values = top_n(aggregates, year, n)
+    names = df_pop["Country/Territory"].astype(str).to_numpy()[rows]
+    fig = go.Figure(go.Bar(
+        x=values,
+        y=names,
+        orientation="h",
+        hovertemplate="<b>%{y}</b><br>인구: %{x:,}<extra></extra>",
+    ))
+    fig.update_layout(
+        title=f"{year}년 인구 상위 {len(rows)}개국",
+        xaxis_title="인구",
+        yaxis=dict(autorange="reversed"),
+        height=max(300, 24 * len(rows) + 120),
+    )
+    return fig
+
+
+def build_movers_bar(df_pop, aggregates, start_year, end_year, n):
+    (gainers, gains), (losers, losses) = biggest_movers(aggregates, start_year, end_year, n)
+    names = df_pop["Country/Territory"].astype(str).to_numpy()
+    rows = np.concatenate([gainers, losers[::-1]])
+    change = np.concatenate([gains, -losses[::-1]])
+    fig = go.Figure(go.Bar(
+        x=change,
+        y=names[rows],
+        orientation="h",
+        marker_color=np.where(change >= 0, "#2ca02c", "#d62728"),
+        hovertemplate="<b>%{y}</b><br>변화: %{x:+,}<extra></extra>",
+    ))
+    fig.update_layout(
+        title=f"{start_year}년 → {end_year}년 인구 증가/감소 상위 {n}개국",
+        xaxis_title="인구 변화",
+        yaxis=dict(autorange="reversed"),
+        height=max(300, 24 * len(rows) + 120),
+    )
+    return fig
+
+
+def get_continent_area(df_pop, aggregates, cache=FIGURE_CACHE):
+    return cache.get_or_build(
+        (df_pop.attrs.get("version"), "continent-area"),
+        lambda: build_continent_area(aggregates),
+    )
+
+
+def get_top_n_bar(df_pop, aggregates, year, n, cache=FIGURE_CACHE):
+    return cache.get_or_build(
+        (figure_version(df_pop, year), "top-n", year, n),
+        lambda: build_top_n_bar(df_pop, aggregates, year, n),
+    )
+
+
+def get_movers_bar(df_pop, aggregates, start_year, end_year, n, cache=FIGURE_CACHE):
+    return cache.get_or_build(
+        (figure_version(df_pop, max(start_year, end_year)), "movers", start_year, end_year, n),
+        lambda: build_movers_bar(df_pop, aggregates, start_year, end_year, n),
+    )
+
+
+# -----------------------------------
+# 그림 미리 만들기 (백그라운드 작업자 하나)
+# -----------------------------------
+def population_warm_up_tasks(df_pop, bin_index, years=None, animation_years=None, share=True, lean=False):
+    """연도 지도, 비율 지도, 연도 애니메이션 지도를 만드는 (캐시 키, 만드는 함수) 목록.
+
+    슬라이더 기본값인 최근 연도부터 만든다. lean이면 화면이 실제로 그리는 경량 지도를 만든다.
+    animation_years가 None이면 애니메이션은 넣지 않는다.
+    """
+    years = POP_YEARS if years is None else years
+    build_map = build_population_map_lean if lean else build_population_map
+    build_share = build_share_map_lean if lean else build_share_map
+    tasks = [
+        (population_map_key(df_pop, year, lean), functools.partial(build_map, df_pop, bin_index, year))
+        for year in sorted(years, reverse=True)
+        if f"{year} Population" in df_pop.columns
+    ]
+    if share and PCT_COL in df_pop.columns:
+        tasks.append((share_map_key(df_pop, lean), functools.partial(build_share, df_pop, bin_index)))
+    if animation_years is not None:
+        tasks.append((
+            population_animation_key(df_pop, animation_years),
+            functools.partial(build_population_animation, df_pop, bin_index, animation_years),
+        ))
+    return tasks
+
+
+class FigureWarmer:
+    """그림 미리 만들기를 백그라운드 스레드 하나에서 차례로 처리한다.
+
+    submit(group, tasks)는 같은 group에서 아직 만들지 않은 이전 작업을 새 목록으로 바꾸므로
+    (예: 투영 연도를 바꾸면 이전 horizon의 남은 그림은 버림) 오래된 작업이 쌓이지 않는다.
+    가장 최근에 넣은 group부터 처리하고, 이미 캐시에 있는 그림은 넣지 않는다.
+    """
+
+    def __init__(self, cache=FIGURE_CACHE):
+        self.cache = cache
+        self._pending = OrderedDict()  # group -> [(key, build), ...]
+        self._busy = False
+        self._cond = threading.Condition()
+        self._thread = None
+
+    def submit(self, group, tasks):
+        tasks = [(key, build) for key, build in tasks if key not in self.cache]
+        with self._cond:
+            if not tasks:
+                self._pending.pop(group, None)
+                return
+            self._pending[group] = tasks
+            self._pending.move_to_end(group, last=False)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="figure-warm-up", daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+
+    def pending(self):
+        with self._cond:
+            return sum(len(tasks) for tasks in self._pending.values())
+
+    def wait_idle(self, timeout=None):
+        # 남은 작업이 없고 만드는 중인 그림도 없을 때까지 기다린다. (벤치마크/테스트용)
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._pending and not self._busy, timeout)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._busy = False
+                self._cond.notify_all()
+                self._cond.wait_for(lambda: self._pending)
+                group, tasks = next(iter(self._pending.items()))
+                key, build = tasks.pop(0)
+                if not tasks:
+                    del self._pending[group]
+                self._busy = True
+            try:
+                self.cache.get_or_build(key, build)
+            except Exception:
+                # 미리 만들기는 최선 노력이다. 실패한 그림은 화면에서 요청할 때 다시 만들고 오류도 그때 보인다.
+                continue
+
+
+FIGURE_WARMER = FigureWarmer()
@@ -0,0 +1,382 @@
+import math
+import random
+import re
+import threading
+import time
+from collections import OrderedDict
+
+# =============================================================================
+# 정수론 엔진 (임의 정밀도 정수로 정확하게 계산)
+# =============================================================================
+# 모든 함수는 파이썬 int로 계산하므로 자릿수 제한 없이 정확하다.
+# 오래 걸릴 수 있는 계산은 time_budget(초)을 받아, 넘기면 BudgetExceeded를 낸다.
+NT_TIME_BUDGET = 2.0
+NT_CACHE_SIZE = 512
+# 입력 문자열 최대 길이 (10진수 약 2만 자리 = 약 66,000비트)
+NT_MAX_INPUT_CHARS = 20_000
+# a^b 를 정확히 계산할 때 허용하는 결과 크기 (비트)
+NT_MAX_POWER_BITS = 4_000_000
+# 모듈러 거듭제곱의 창 크기 (지수를 이 비트 수씩 끊어 미리 만든 a^j 표를 곱한다)
+NT_POW_WINDOW_BITS = 5
+# 이 비트 수 이하의 지수는 시간 제한 확인 없이 내장 pow로 바로 계산한다.
+NT_POW_DIRECT_BITS = 1024
+# 결정적 범위를 넘는 수에서 Miller–Rabin 무작위 밑의 개수 (오판 확률 ≤ 4^-NT_MR_ROUNDS)
+NT_MR_ROUNDS = 16
+
+# 작은 소수로 먼저 나눠 보는 시행 나눗셈 범위
+_SMALL_PRIMES = [p for p in range(2, 1000) if all(p % q for q in range(2, math.isqrt(p) + 1))]
+# n < 3.3 × 10^24 이면 이 밑들로 Miller–Rabin 판정이 결정적이다.
+_MR_BASES = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41]
+_MR_DETERMINISTIC_LIMIT = 3_317_044_064_679_887_385_961_981
+
+
+class NumberTheoryError(ValueError):
+    """정의되지 않는 입력 (예: 역원이 없는 수, 모순인 합동식). 메시지는 화면에 그대로 쓴다."""
+
+
+class BudgetExceeded(TimeoutError):
+    """시간 제한 안에 끝나지 않은 계산. partial에 그때까지의 결과가 들어 있을 수 있다."""
+
+    def __init__(self, message, partial=None):
+        super().__init__(message)
+        self.partial = partial
+
+
+def _deadline(time_budget):
+    return None if time_budget is None else time.perf_counter() + time_budget
+
+
+def _check(deadline, partial=None):
+    if deadline is not None and time.perf_counter() > deadline:
+        raise BudgetExceeded("시간 제한 안에 계산을 끝내지 못했습니다.", partial)
+
+
+# -----------------------------------
+# 결과 캐시 (시간 제한은 키에 넣지 않음)
+# -----------------------------------
+def budgeted_cache(maxsize=NT_CACHE_SIZE):
+    """위치 인자로 결과를 캐시하는 LRU 데코레이터. time_budget은 키에서 뺀다.
+
+    시간 제한에 걸려 예외가 난 호출은 캐시하지 않으므로, 나중에 더 긴 제한으로
+    다시 부르면 새로 계산한다.
+    """
+    def decorator(fn):
+        entries = OrderedDict()
+        lock = threading.Lock()
+        stats = {"hits": 0, "misses": 0}
+
+        def wrapper(*args, time_budget=NT_TIME_BUDGET):
+            with lock:
+                if args in entries:
+                    entries.move_to_end(args)
+                    stats["hits"] += 1
+                    return entries[args]
+                stats["misses"] += 1
+            value = fn(*args, time_budget=time_budget)
+            with lock:
+                entries[args] = value
+                entries.move_to_end(args)
+                while len(entries) > maxsize:
+                    entries.popitem(last=False)
+            return value
+
+        def cache_info():
+            with lock:
+                return {"entries": len(entries), **stats}
+
+        wrapper.cache_info = cache_info
+        wrapper.cache_clear = entries.clear
+        wrapper.__name__ = fn.__name__
+        wrapper.__doc__ = fn.__doc__
+        return wrapper
+    return decorator
+
+
+# -----------------------------------
+# 입력 / 출력
+# -----------------------------------
+# 2^521-1 처럼 거듭제곱 ± 상수로 쓴 큰 수
+_POWER_FORM = re.compile(r"^(\d+)\s*\^\s*(\d+)\s*(?:([+-])\s*(\d+))?$")
+
+
+def _parse_decimal(digits):
+    # 파이썬의 문자열 -> int 자릿수 제한(4300자리)을 피하려고 4000자리씩 나눠 변환한다.
+    value = 0
+    for start in range(0, len(digits), 4000):
+        chunk = digits[start:start + 4000]
+        value = value * 10 ** len(chunk) + int(chunk)
+    return value
+
+
+def parse_int(text):
+    """정수 입력을 읽는다. 10진수, 0x 16진수, 'a^b±c' 형태를 받는다."""
+    s = text.strip().replace(",", "").replace("_", "").replace(" ", "")
+    if not s:
+        raise NumberTheoryError("정수를 입력하세요.")
+    if len(s) > NT_MAX_INPUT_CHARS:
+        raise NumberTheoryError(f"입력이 너무 깁니다. (최대 {NT_MAX_INPUT_CHARS:,}자)")
+
+    sign = 1
+    if s[0] in "+-":
+        sign = -1 if s[0] == "-" else 1
+        s = s[1:]
+
+    m = _POWER_FORM.match(s)
+    if m:
+        base, exp = _parse_decimal(m.group(1)), _parse_decimal(m.group(2))
+        if exp * max(base.bit_length(), 1) > NT_MAX_POWER_BITS:
+            raise NumberTheoryError("거듭제곱 꼴의 입력이 너무 큽니다.")
+        value = base ** exp
+        if m.group(3):
+            value += _parse_decimal(m.group(4)) * (1 if m.group(3) == "+" else -1)
+        return sign * value
+    if s[:2].lower() == "0x" and re.fullmatch(r"[0-9a-fA-F]+", s[2:]):
+        return sign * int(s[2:], 16)
+    if s.isdigit():
+        return sign * _parse_decimal(s)
+    raise NumberTheoryError(f"정수로 읽을 수 없습니다: {text.strip()[:40]}")
+
+
+def format_int(x, max_digits=60):
+    """큰 정수를 '앞자리…뒷자리 (N자리)'로 줄여 보여 준다. 짧으면 그대로."""
+    if x.bit_length() <= 3 * max_digits:
+        return str(x)
+    sign = "-" if x < 0 else ""
+    x = abs(x)
+    # 자릿수는 비트 길이에서 어림한 뒤 앞자리 몫으로 보정한다. (str()은 자릿수 제한에 걸림)
+    shift = max(x.bit_length() - 64, 0)
+    digits = int((math.log10(x >> shift) + shift * math.log10(2))) + 1
+    head_len = max_digits // 2
+    while True:
+        head = x // 10 ** (digits - head_len)
+        if head >= 10 ** head_len:
+            digits += 1
+        elif head < 10 ** (head_len - 1):
+            digits -= 1
+        else:
+            break
+    tail = str(x % 10 ** head_len).zfill(head_len)
+    short = f"{sign}{head}…{tail} ({digits:,}자리)"
+    # 줄인 표기가 원래 수보다 길어지는 자릿수(60자리 안팎)에서는 그대로 보여 준다.
+    return short if len(short) < len(sign) + digits else f"{sign}{x}"
+
+
+# -----------------------------------
+# 모듈러 거듭제곱 / 역원 / CRT
+# -----------------------------------
+@budgeted_cache()
+def mod_pow(a, b, n, time_budget=NT_TIME_BUDGET):
+    """a^b mod n. 지수를 NT_POW_WINDOW_BITS 비트씩 읽으며 왼쪽부터 제곱-곱하기로 계산한다.
+
+    창 하나마다 제곱을 창 크기만큼 하고 미리 만든 a^j 표의 값을 한 번 곱한다.
+    창 사이사이에 시간 제한을 확인하며, b < 0 이면 a의 역원을 거듭제곱한다.
+    """
+    if n <= 0:
+        raise NumberTheoryError("법 n은 양의 정수여야 합니다.")
+    if n == 1:
+        return 0
+    if b < 0:
+        a, b = mod_inverse(a, n, time_budget=time_budget), -b
+    return _windowed_pow(a % n, b, n, _deadline(time_budget))
+
+
+def _windowed_pow(a, b, n, deadline):
+    # mod_pow의 본체 (0 ≤ a < n, b ≥ 0). 지수가 짧으면 내장 pow, 길면 창마다 시간 제한을 확인한다.
+    # 큰 수의 곱셈 한 번보다 시간 확인이 훨씬 싸므로 창 하나(제곱 NT_POW_WINDOW_BITS번)마다 확인한다.
+    if b.bit_length() <= NT_POW_DIRECT_BITS:
+        return pow(a, b, n)
+
+    w = NT_POW_WINDOW_BITS
+    table = [1] * (1 << w)
+    for j in range(1, 1 << w):
+        table[j] = table[j - 1] * a % n
+    mask = (1 << w) - 1
+    result = 1
+    for i in range(-(-b.bit_length() // w) - 1, -1, -1):
+        for _ in range(w):
+            result = result * result % n
+        result = result * table[(b >> (i * w)) & mask] % n
+        _check(deadline)
+    return result
+
+
+def _egcd(a, b):
+    # 확장 유클리드 호제법 (반복문): g = gcd(a, b) = a*x + b*y
+    x0, y0, x1, y1 = 1, 0, 0, 1
+    while b:
+        q, a, b = a // b, b, a % b
+        x0, x1 = x1, x0 - q * x1
+        y0, y1 = y1, y0 - q * y1
+    return a, x0, y0
+
+
+@budgeted_cache()
+def mod_inverse(a, n, time_budget=NT_TIME_BUDGET):
+    """a × x ≡ 1 (mod n) 인 0 ≤ x < n. gcd(a, n) ≠ 1 이면 NumberTheoryError."""
+    if n <= 0:
+        raise NumberTheoryError("법 n은 양의 정수여야 합니다.")
+    g, x, _ = _egcd(a % n, n)
+    if g != 1:
+        raise NumberTheoryError(f"gcd(a, n) = {format_int(g)} 이므로 역원이 없습니다.")
+    return x % n
+
+
+@budgeted_cache()
+def crt(residues, moduli, time_budget=NT_TIME_BUDGET):
+    """x ≡ r_i (mod m_i) 를 모두 만족하는 (x, M)을 돌려준다. 0 ≤ x < M = lcm(m_i).
+
+    법끼리 서로소가 아니어도 되고, 합동식이 서로 모순이면 NumberTheoryError를 낸다.
+    residues, moduli는 튜플로 넘긴다. (캐시 키)
+    """
+    if len(residues) != len(moduli) or not moduli:
+        raise NumberTheoryError("나머지와 법의 개수가 같아야 합니다.")
+    deadline = _deadline(time_budget)
+    x, m = 0, 1
+    for r, mi in zip(residues, moduli):
+        if mi <= 0:
+            raise NumberTheoryError("법은 모두 양의 정수여야 합니다.")
+        # x + m*t ≡ r (mod mi)  ->  m*t ≡ r - x (mod mi)
+        g, p, _ = _egcd(m, mi)
+        if (r - x) % g:
+            raise NumberTheoryError(f"x ≡ {format_int(r)} (mod {format_int(mi)}) 이 앞의 합동식과 모순입니다.")
+        lcm = m // g * mi
+        t = (r - x) // g * p % (mi // g)
+        x, m = (x + m * t) % lcm, lcm
+        _check(deadline)
+    return x, m
+
+
+# -----------------------------------
+# 소수 판정 / 소인수분해
+# -----------------------------------
+def _miller_rabin_round(n, d, s, a, deadline):
+    # 큰 n에서는 a^d mod n 한 번이 몇 초~몇 분 걸리므로 창 단위로 시간 제한을 확인하는 경로로 계산한다.
+    x = _windowed_pow(a, d, n, deadline)
+    if x == 1 or x == n - 1:
+        return True
+    for _ in range(s - 1):
+        x = x * x % n
+        if x == n - 1:
+            return True
+        _check(deadline)
+    return False
+
+
+def _is_prime(n, rounds, deadline):
+    if n < 2:
+        return False
+    for p in _SMALL_PRIMES:
+        if n % p == 0:
+            return n == p
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+
+    if n < _MR_DETERMINISTIC_LIMIT:
+        bases = _MR_BASES
+    else:
+        # 결정적 밑이 없는 범위: 밑 2 + 고정된 시드의 무작위 밑으로 오판 확률을 4^-rounds 이하로
+        rng = random.Random(n)
+        bases = [2] + [rng.randrange(3, n - 1) for _ in range(rounds)]
+    for a in bases:
+        if not _miller_rabin_round(n, d, s, a, deadline):
+            return False
+        _check(deadline)
+    return True
+
+
+@budgeted_cache()
+def is_probable_prime(n, rounds=NT_MR_ROUNDS, time_budget=NT_TIME_BUDGET):
+    """Miller–Rabin 소수 판정. n < 3.3 × 10^24 에서는 결정적이고, 그 이상은 오판 확률 ≤ 4^-rounds."""
+    return _is_prime(n, rounds, _deadline(time_budget))
+
+
+def _pollard_rho(n, deadline, partial):
+    # Brent 변형 Pollard-rho. 곱을 모아 gcd를 가끔만 계산한다.
+    if n % 2 == 0:
+        return 2
+    rng = random.Random(n)
+    while True:
+        y, c, m = rng.randrange(1, n), rng.randrange(1, n), 128
+        g = r = q = 1
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(m, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = math.gcd(q, n)
+                k += m
+                _check(deadline, partial)
+            r *= 2
+        if g == n:
+            # 한꺼번에 곱한 탓에 인수를 놓쳤다면 한 걸음씩 다시 찾는다.
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % n
+                g = math.gcd(abs(x - ys), n)
+        if g != n:
+            return g
+
+
+@budgeted_cache()
+def factorize(n, time_budget=NT_TIME_BUDGET):
+    """n ≥ 2의 소인수분해를 {소수: 지수} (오름차순)로 돌려준다.
+
+    작은 소수로 나눈 뒤 Miller–Rabin으로 판정하며 Pollard-rho로 쪼갠다. 시간 제한에 걸리면
+    BudgetExceeded.partial 에 {"factors": 찾은 소인수, "remaining": 아직 분해하지 못한 수 목록}을 담는다.
+    """
+    if n < 2:
+        raise NumberTheoryError("2 이상의 정수를 입력하세요.")
+    deadline = _deadline(time_budget)
+    factors = {}
+    for p in _SMALL_PRIMES:
+        while n % p == 0:
+            factors[p] = factors.get(p, 0) + 1
+            n //= p
+
+    pending = [n] if n > 1 else []
+    partial = {"factors": factors, "remaining": pending}
+    while pending:
+        m = pending.pop()
+        if _is_prime(m, NT_MR_ROUNDS, deadline):
+            factors[m] = factors.get(m, 0) + 1
+            continue
+        root = math.isqrt(m)
+        if root * root == m:
+            pending += [root, root]
+            continue
+        pending.append(m)  # 시간 제한에 걸리면 아직 남은 수로 보고되도록
+        d = _pollard_rho(m, deadline, partial)
+        pending.pop()
+        pending += [d, m // d]
+    return dict(sorted(factors.items()))
+
+
+@budgeted_cache()
+def exact_power(a, b, time_budget=NT_TIME_BUDGET):
+    """a^b 를 정수로 정확히 계산한다. 결과가 NT_MAX_POWER_BITS 비트를 넘으면 NumberTheoryError.
+
+    결과 크기는 계산 전에 b·log2|a| 로 어림해 막는다. 지수 비트마다 왼쪽부터 제곱-곱하기를 하며
+    그 사이사이에 시간 제한을 확인한다. (곱셈 한 번은 중간에 멈출 수 없으므로 그 직후에 확인됨)
+    """
+    if b < 0:
+        raise NumberTheoryError("정확한 정수 거듭제곱은 b ≥ 0 일 때만 계산합니다.")
+    if abs(a) <= 1 or b == 0:
+        return a ** b
+    if b * math.log2(abs(a)) > NT_MAX_POWER_BITS:
+        raise NumberTheoryError(f"결과가 너무 큽니다. (최대 약 {NT_MAX_POWER_BITS:,}비트)")
+
+    deadline = _deadline(time_budget)
+    result = 1
+    for bit in bin(b)[2:]:
+        _check(deadline)
+        result *= result
+        if bit == "1":
+            result *= a
+    return result
@@ -0,0 +1,383 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# =============================================================================
+# 세계 인구 데이터: CSV -> 열 단위 .npy 저장소 (메모리 매핑)
+# =============================================================================
+# CSV를 한 번만 파싱해 열마다 .npy 파일로 저장해 두고, 이후에는 np.load(mmap_mode="r")로
+# 다시 연다. 숫자 열은 파일을 그대로 매핑하므로 프로세스가 새로 떠도 파싱/복사 비용이 없다.
+# CSV는 패키지 밖, main.py와 같은 폴더(저장소 루트)에 있다.
+APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+POP_CSV_PATH = os.path.join(APP_ROOT, "world_population.csv")
+POP_CACHE_DIRNAME = ".pop_cache"
+POP_STORE_VERSION = 2
+
+# CSV에 들어 있는 연도별 인구 열: '1970 Population', '1980 Population', ...
+POP_YEARS = [1970, 1980, 1990, 2000, 2010, 2015, 2020, 2022]
+
+# 열 이름 -> 저장 dtype. 여기에 없는 열은 pandas 기본 dtype 그대로 저장한다.
+# 인구/면적은 uint32(최대 약 42억), 비율 값은 float32, 문자열은 범주형으로 줄인다.
+POP_SCHEMA = {
+    "Rank": "uint32",
+    "CCA3": "category",
+    "Country/Territory": "category",
+    "Capital": "category",
+    "Continent": "category",
+    **{f"{year} Population": "uint32" for year in POP_YEARS},
+    "Area (km²)": "uint32",
+    "Density (per km²)": "float32",
+    "Growth Rate": "float32",
+    "World Population Percentage": "float32",
+}
+
+
+def _file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _write_json(path, obj):
+    # 다른 프로세스가 반쯤 쓰인 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체한다.
+    tmp_fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    with os.fdopen(tmp_fd, "w", encoding="utf-8") as f:
+        json.dump(obj, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def compact_values(col, dtype):
+    # 숫자 열을 스키마 dtype으로 줄인다. 값이 범위를 벗어나거나 결측값이 있으면 원래 dtype을 유지한다.
+    values = col.to_numpy()
+    target = np.dtype(dtype)
+    if target.kind in "ui":
+        if col.isna().any():
+            return values
+        info = np.iinfo(target)
+        if len(values) and (values.min() < info.min or values.max() > info.max):
+            return values
+    return values.astype(target)
+
+
+def build_column_store(csv_path, store_dir):
+    """CSV를 파싱해 store_dir에 열 단위 .npy 파일과 manifest.json을 만든다.
+
+    숫자 열은 POP_SCHEMA의 dtype으로 줄여서, 문자열 열은 (int32 코드 .npy + 범주 목록)으로
+    사전 인코딩해 저장한다. 기본 dtype과 압축 dtype의 메모리 사용량도 manifest에 기록한다.
+    """
+    df = pd.read_csv(csv_path)
+    memory_default = int(df.memory_usage(deep=True).sum())
+    parent = os.path.dirname(store_dir)
+    os.makedirs(parent, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(dir=parent, prefix=".build-")
+
+    columns = []
+    for i, name in enumerate(df.columns):
+        col = df[name]
+        entry = {"name": name, "file": f"col{i}.npy"}
+        if pd.api.types.is_numeric_dtype(col):
+            entry["kind"] = "numeric"
+            values = compact_values(col, POP_SCHEMA.get(name, col.dtype))
+            np.save(os.path.join(tmp_dir, entry["file"]), values)
+        else:
+            entry["kind"] = "category"
+            codes, categories = pd.factorize(col, sort=True)
+            entry["categories"] = [str(c) for c in categories]
+            np.save(os.path.join(tmp_dir, entry["file"]), codes.astype(np.int32))
+        columns.append(entry)
+
+    manifest = {"version": POP_STORE_VERSION, "n_rows": len(df), "columns": columns}
+    manifest["memory_bytes"] = {
+        "default": memory_default,
+        "compact": int(_frame_from_store(tmp_dir, manifest).memory_usage(deep=True).sum()),
+    }
+    _write_json(os.path.join(tmp_dir, "manifest.json"), manifest)
+    try:
+        os.replace(tmp_dir, store_dir)
+    except OSError:
+        # 다른 프로세스가 먼저 같은 저장소를 만들었다면 그것을 그대로 쓴다.
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def _frame_from_store(store_dir, manifest):
+    data = {}
+    for entry in manifest["columns"]:
+        values = np.load(os.path.join(store_dir, entry["file"]), mmap_mode="r")
+        if entry["kind"] == "numeric":
+            data[entry["name"]] = values
+        else:
+            # 결측값은 factorize 코드 -1 로 저장되어 있고, from_codes도 -1을 결측으로 본다.
+            data[entry["name"]] = pd.Categorical.from_codes(values, entry["categories"])
+    return pd.DataFrame(data, copy=False)
+
+
+def open_column_store(store_dir):
+    """열 단위 저장소를 메모리 매핑으로 열어 DataFrame으로 돌려준다.
+
+    숫자 열은 읽기 전용 memmap을 복사 없이 감싸고, 문자열 열은 범주형으로 복원한다.
+    df.attrs["version"]은 저장소 이름(포맷 버전 + CSV 해시)으로, 데이터 버전 키로 쓴다.
+    df.attrs["memory_bytes"]에 기본 dtype / 압축 dtype 메모리 사용량(bytes)이 들어 있다.
+    """
+    with open(os.path.join(store_dir, "manifest.json"), encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    df = _frame_from_store(store_dir, manifest)
+    df.attrs["version"] = os.path.basename(os.path.normpath(store_dir))
+    df.attrs["memory_bytes"] = manifest["memory_bytes"]
+    return df
+
+
+def load_population_frame(csv_path=POP_CSV_PATH, cache_dir=None):
+    """CSV에 대응하는 열 저장소를 (없으면 만들어서) 열어 준다.
+
+    저장소는 CSV 내용의 SHA-256으로 구분하고, (mtime, 크기) -> 해시 대응을 index.json에
+    기록해 파일이 바뀌지 않았으면 해시 계산 없이 바로 연다.
+    """
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(os.path.abspath(csv_path)), POP_CACHE_DIRNAME)
+    os.makedirs(cache_dir, exist_ok=True)
+
+    stat = os.stat(csv_path)
+    stamp = f"{os.path.abspath(csv_path)}:{stat.st_mtime_ns}:{stat.st_size}"
+    index_path = os.path.join(cache_dir, "index.json")
+    try:
+        with open(index_path, encoding="utf-8") as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        index = {}
+
+    digest = index.get(stamp)
+    store_dir = os.path.join(cache_dir, f"v{POP_STORE_VERSION}-{digest}")
+    if digest is None or not os.path.exists(os.path.join(store_dir, "manifest.json")):
+        digest = _file_sha256(csv_path)
+        store_dir = os.path.join(cache_dir, f"v{POP_STORE_VERSION}-{digest}")
+        if not os.path.exists(os.path.join(store_dir, "manifest.json")):
+            build_column_store(csv_path, store_dir)
+        # 같은 CSV의 예전 (mtime, 크기) 기록은 지운다.
+        prefix = f"{os.path.abspath(csv_path)}:"
+        index = {k: v for k, v in index.items() if not k.startswith(prefix)}
+        index[stamp] = digest
+        _write_json(index_path, index)
+
+    return open_column_store(store_dir)
+
+
+# =============================================================================
+# 연도 × 구간 인덱스 (지도 색칠용 구간 코드를 미리 계산)
+# =============================================================================
+# 인구수 구간 (대략적인 구간)
+POP_BINS = [0, 1e7, 5e7, 1e8, 5e8, 2e9]
+POP_BIN_LABELS = ["< 10M", "10M–50M", "50M–100M", "100M–500M", "≥ 500M"]
+
+# world population percentage 구간 (값은 % 단위)
+PCT_COL = "World Population Percentage"
+PCT_BINS = [0, 0.05, 0.1, 0.5, 1, 3, 10, 25]
+PCT_BIN_LABELS = [
+    "< 0.05%",
+    "0.05–0.1%",
+    "0.1–0.5%",
+    "0.5–1%",
+    "1–3%",
+    "3–10%",
+    "≥ 10%"
+]
+
+
+def bin_codes(values, bins):
+    """pd.cut(values, bins, include_lowest=True)과 같은 구간 번호를 int8로 돌려준다.
+
+    구간은 오른쪽 닫힘 (b[i-1], b[i]] 이고 첫 구간만 [b[0], b[1]]. 범위 밖/결측은 -1.
+    경계는 값과 같은 dtype으로 맞춰 비교한다. (float32 열에서 0.1 같은 경계가 어긋나지 않도록)
+    """
+    values = np.asarray(values)
+    bins = np.asarray(bins, dtype=values.dtype if values.dtype.kind == "f" else np.float64)
+    codes = np.searchsorted(bins, values, side="left") - 1
+    codes[values == bins[0]] = 0
+    codes[~((values >= bins[0]) & (values <= bins[-1]))] = -1
+    return codes.astype(np.int8)
+
+
+def build_bin_index(df, years=None):
+    """연도별 인구 열 + 세계 인구 비율 열의 구간 코드를 한 번에 계산한 인덱스.
+
+    codes는 (행 수, 열 수) int8 행렬이고 열 우선(F) 순서라 한 열을 꺼내도 연속 메모리다.
+    years를 주지 않으면 CSV에 있는 연도(POP_YEARS)만 사용한다.
+    """
+    years = POP_YEARS if years is None else years
+    columns = [f"{year} Population" for year in years if f"{year} Population" in df.columns]
+    specs = [(col, POP_BINS, POP_BIN_LABELS) for col in columns]
+    if PCT_COL in df.columns:
+        specs.append((PCT_COL, PCT_BINS, PCT_BIN_LABELS))
+
+    codes = np.empty((len(df), len(specs)), dtype=np.int8, order="F")
+    for j, (col, bins, _) in enumerate(specs):
+        codes[:, j] = bin_codes(df[col].to_numpy(), bins)
+
+    return {
+        "codes": codes,
+        "position": {col: j for j, (col, _, _) in enumerate(specs)},
+        "labels": {col: labels for col, _, labels in specs},
+    }
+
+
+def binned(index, col):
+    # 인덱스에서 한 열의 구간 코드를 꺼내 순서 있는 범주형으로 감싼다. (pd.cut 결과와 같은 모양)
+    return pd.Categorical.from_codes(
+        index["codes"][:, index["position"][col]],
+        categories=index["labels"][col],
+        ordered=True,
+    )
+
+
+# =============================================================================
+# 1년 단위 연도별 인구 (스냅숏 사이 보간 + 성장률로 이후 연도 투영)
+# =============================================================================
+GROWTH_COL = "Growth Rate"
+# 투영할 수 있는 마지막 연도
+POP_PROJECTION_MAX_YEAR = 2050
+# 연도별 프레임에 함께 담는 열
+ANNUAL_ID_COLUMNS = ["CCA3", "Country/Territory", "Continent"]
+
+
+def interpolate_annual(snapshots, snapshot_years, years):
+    """(행 수, 스냅숏 수) 행렬을 (행 수, 연도 수) 행렬로 한 번에 보간한다.
+
+    두 스냅숏 값이 모두 양수면 그 사이를 일정한 연 증가율로 잇는 기하 보간, 아니면 선형 보간.
+    스냅숏 연도 자체는 원래 값을 그대로 쓴다.
+    """
+    snapshots = np.asarray(snapshots)
+    snap_years = np.asarray(snapshot_years)
+    years = np.asarray(years)
+    hi = np.clip(np.searchsorted(snap_years, years, side="left"), 1, len(snap_years) - 1)
+    lo = hi - 1
+    w = (years - snap_years[lo]) / (snap_years[hi] - snap_years[lo])
+
+    # 필요한 스냅숏 열만 float64로 바꾼다. (연도 하나씩 부르면 임시 배열이 열 몇 개 크기로 끝남)
+    a = snapshots[:, lo].astype(np.float64)
+    b = snapshots[:, hi].astype(np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        geometric = a * (b / a) ** w
+    values = np.where((a > 0) & (b > 0), geometric, a + (b - a) * w)
+
+    exact = np.isin(years, snap_years)
+    values[:, exact] = snapshots[:, np.searchsorted(snap_years, years[exact])]
+    return values
+
+
+def project_annual(last_values, growth, last_year, years):
+    # 마지막 스냅숏 값에 연 성장 배율을 (연도 - last_year)번 곱한다. (행 수, 연도 수)
+    steps = np.asarray(years) - last_year
+    return np.asarray(last_values, dtype=np.float64)[:, None] * np.asarray(growth, dtype=np.float64)[:, None] ** steps
+
+
+def build_annual_frame(df, horizon=None):
+    """1970년부터 horizon년까지 1년 단위 '{연도} Population' 열을 가진 프레임을 만든다.
+
+    스냅숏 연도 사이는 interpolate_annual, 마지막 스냅숏 이후는 Growth Rate로 project_annual.
+    국가별 반복문 없이 연도 열 하나씩 계산해 POP_SCHEMA와 같은 uint32 행렬에 바로 채우므로,
+    float64 중간 배열은 열 몇 개 크기를 넘지 않는다. (uint32 범위를 넘는 값이 나오면 uint64로)
+    attrs["version"]은 원본 버전에 마지막 연도를 붙인 값이라 그림 캐시 키가 원본 프레임과 겹치지 않는다.
+    attrs["observed_version"]은 마지막 연도를 뺀 값으로, 관측 연도 그림을 horizon끼리 함께 쓸 때의 키다.
+    """
+    first, last = POP_YEARS[0], POP_YEARS[-1]
+    horizon = last if horizon is None else min(max(int(horizon), last), POP_PROJECTION_MAX_YEAR)
+    snapshots = np.column_stack([df[f"{year} Population"].to_numpy() for year in POP_YEARS])
+    growth = df[GROWTH_COL].to_numpy()
+
+    years = np.arange(first, horizon + 1)
+    values = np.empty((len(df), len(years)), dtype=POP_SCHEMA[f"{last} Population"], order="F")
+    for j, year in enumerate(years):
+        if year <= last:
+            column = interpolate_annual(snapshots, POP_YEARS, [year])[:, 0]
+        else:
+            column = project_annual(snapshots[:, -1], growth, last, [year])[:, 0]
+        column = np.rint(column)
+        if len(column) and column.max() > np.iinfo(values.dtype).max:
+            values = values.astype(np.uint64, order="F")
+        values[:, j] = column
+
+    columns = [f"{year} Population" for year in years]
+    annual = pd.DataFrame(values, columns=columns, index=df.index, copy=False)
+    for i, col in enumerate(c for c in ANNUAL_ID_COLUMNS if c in df.columns):
+        annual.insert(i, col, df[col])
+    if PCT_COL in df.columns:
+        annual[PCT_COL] = df[PCT_COL]
+    annual.attrs["version"] = f"{df.attrs.get('version')}-annual-{horizon}"
+    # 마지막 스냅숏 연도까지의 열은 horizon과 무관하다. (그림 캐시가 horizon끼리 함께 쓰는 키)
+    annual.attrs["observed_version"] = f"{df.attrs.get('version')}-annual"
+    annual.attrs["years"] = [int(year) for year in years]
+    annual.attrs["last_observed_year"] = last
+    return annual
+
+
+# =============================================================================
+# 집계 인덱스 (대륙 × 연도 합계, 연도별 인구 순위)
+# =============================================================================
+def build_aggregates(df, years=None):
+    """대륙별 연도 합계 행렬과 연도별 순위 배열을 한 번에 계산한 인덱스.
+
+    values: (행 수, 연도 수) 인구 행렬
+    order[:, j]: j번째 연도의 인구 내림차순 행 번호 (order[:n, j]가 곧 상위 n개국)
+    continent_sums: (대륙 수, 연도 수) 합계 행렬
+    모두 열 우선(F) 순서라 연도 하나를 꺼내도 연속 메모리다.
+    """
+    years = POP_YEARS if years is None else years
+    years = [year for year in years if f"{year} Population" in df.columns]
+    values = np.empty((len(df), len(years)), dtype=np.int64, order="F")
+    for j, year in enumerate(years):
+        values[:, j] = df[f"{year} Population"].to_numpy()
+
+    continent = pd.Categorical(df["Continent"])
+    continent_sums = np.zeros((len(continent.categories), len(years)), dtype=np.int64)
+    known = continent.codes >= 0
+    np.add.at(continent_sums, continent.codes[known], values[known])
+
+    # 같은 인구면 원래 행 순서를 유지하도록 안정 정렬
+    order = np.asfortranarray(np.argsort(-values, axis=0, kind="stable").astype(np.int32))
+
+    return {
+        "years": np.asarray(years),
+        "position": {int(year): j for j, year in enumerate(years)},
+        "values": values,
+        "order": order,
+        "continents": [str(c) for c in continent.categories],
+        "continent_sums": np.asfortranarray(continent_sums),
+    }
+
+
+def top_n(aggregates, year, n):
+    # year의 인구 상위 n개 (행 번호, 인구) — 미리 정렬해 둔 배열의 앞부분만 잘라 온다.
+    j = aggregates["position"][year]
+    rows = aggregates["order"][:n, j]
+    return rows, aggregates["values"][rows, j]
+
+
+def continent_rollup(aggregates, year=None):
+    # year를 주면 그해의 대륙별 합계 벡터, 주지 않으면 (대륙 수, 연도 수) 행렬 전체
+    sums = aggregates["continent_sums"]
+    return sums if year is None else sums[:, aggregates["position"][year]]
+
+
+def biggest_movers(aggregates, start_year, end_year, n):
+    """두 연도 사이 인구 증가폭 상위 n개와 감소폭 상위 n개 (행 번호, 변화량)를 돌려준다.
+
+    변화량 벡터 한 번과 argpartition으로 전체 정렬 없이 고른다.
+    """
+    values = aggregates["values"]
+    change = values[:, aggregates["position"][end_year]] - values[:, aggregates["position"][start_year]]
+    n = min(n, len(change))
+
+    def pick(scores):
+        rows = np.argpartition(-scores, n - 1)[:n] if n < len(scores) else np.arange(len(scores))
+        return rows[np.argsort(-scores[rows], kind="stable")]
+
+    gainers = pick(change)
+    losers = pick(-change)
+    return (gainers, change[gainers]), (losers, change[losers])
@@ -0,0 +1,540 @@
+import functools
+import hashlib
+import math
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# =============================================================================
+# 확률 시뮬레이터 엔진 (NumPy 청크 샘플링)
+# =============================================================================
+# 한 번에 뽑는 표본 수. 시행 횟수와 상관없이 메모리 사용량은 이 크기로 고정된다.
+SIM_CHUNK_SIZE = 1 << 20
+SIM_MAX_TRIALS = 1_000_000_000
+
+
+def draw_dtype(n_outcomes):
+    # 0..n_outcomes-1 을 담는 가장 작은 부호 없는 정수 dtype. (256개 이하면 uint8)
+    return np.min_scalar_type(max(int(n_outcomes) - 1, 0))
+
+
+def simulate_counts(n_outcomes, n_trials, rng=None, chunk_size=SIM_CHUNK_SIZE):
+    """0..n_outcomes-1 중 균등하게 n_trials번 뽑아 결과별 도수 벡터를 반환한다.
+
+    결과 전체를 저장하지 않고 chunk_size 단위로 뽑아 np.bincount로 누적한다.
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    counts = np.zeros(n_outcomes, dtype=np.int64)
+    remaining = int(n_trials)
+    while remaining > 0:
+        size = min(chunk_size, remaining)
+        draws = rng.integers(0, n_outcomes, size=size, dtype=draw_dtype(n_outcomes))
+        counts += np.bincount(draws, minlength=n_outcomes)
+        remaining -= size
+    return counts
+
+
+# -----------------------------------
+# 멀티 프로세스 실행 (작업자별 독립 시드)
+# -----------------------------------
+def split_trials(n_trials, n_workers):
+    # 시행 횟수를 작업자 수로 최대한 고르게 나눈다. (앞쪽 작업자가 나머지를 1개씩 더 맡음)
+    base, extra = divmod(int(n_trials), n_workers)
+    return [base + (1 if i < extra else 0) for i in range(n_workers)]
+
+
+def worker_seeds(seed, n_workers):
+    # 하나의 마스터 시드에서 서로 독립인 작업자별 SeedSequence를 만든다.
+    return np.random.SeedSequence(seed).spawn(n_workers)
+
+
+def _simulate_part(n_outcomes, n_trials, seed_seq, chunk_size):
+    # 프로세스 풀에서 실행되므로 모듈 최상위 함수여야 한다. (pickle 가능)
+    return simulate_counts(n_outcomes, n_trials, np.random.default_rng(seed_seq), chunk_size)
+
+
+def _run_seeded(part_fn, part_args, n_trials, seed, n_workers, executor):
+    # n_trials를 작업자별로 나눠 part_fn(*part_args, 시행 수, 시드, ...)을 실행하고 도수를 합친다.
+    parts = split_trials(n_trials, n_workers)
+    seeds = worker_seeds(seed, n_workers)
+    args = [[arg] * n_workers for arg in part_args[:-1]] + [parts, seeds, [part_args[-1]] * n_workers]
+    if executor is None or n_workers == 1:
+        results = map(part_fn, *args)
+    else:
+        results = executor.map(part_fn, *args)
+
+    counts = None
+    for part_counts in results:
+        counts = part_counts if counts is None else counts + part_counts
+    return counts
+
+
+def simulate_counts_seeded(n_outcomes, n_trials, seed, n_workers=1, executor=None,
+                           chunk_size=SIM_CHUNK_SIZE):
+    """마스터 시드로 재현 가능한 도수 벡터를 계산한다.
+
+    n_trials를 n_workers개로 나누고 각 조각을 독립 스트림으로 뽑아 도수를 합친다.
+    같은 (seed, n_workers)이면 executor 유무와 관계없이 결과가 비트 단위로 같다.
+    """
+    return _run_seeded(_simulate_part, (n_outcomes, chunk_size), n_trials, seed, n_workers, executor)
+
+
+# -----------------------------------
+# 시드 고정 실행 결과 캐시 (프로세스 전역 LRU)
+# -----------------------------------
+# 같은 (실험, 분포, 시행 횟수, 시드, 작업자 수)는 결과가 비트 단위로 같으므로 세션끼리 공유한다.
+# 도수 벡터만 저장하고, 바이트 합계가 상한을 넘으면 가장 오래 쓰지 않은 결과부터 버린다.
+SIM_CACHE_MAX_BYTES = 16 * 1024 * 1024
+# 항목마다 키/딕셔너리 칸이 차지하는 대략의 크기 (bytes)
+SIM_CACHE_ENTRY_OVERHEAD = 256
+
+
+def distribution_key(probs):
+    # 확률 벡터를 짧은 해시로 바꾼 캐시 키 조각. (결과가 수만 개여도 키는 작게 유지)
+    probs = np.ascontiguousarray(probs, dtype=np.float64)
+    return f"{len(probs)}:{hashlib.blake2b(probs.tobytes(), digest_size=16).hexdigest()}"
+
+
+def simulation_key(experiment, distribution, n_trials, seed, n_workers):
+    # 작업자 수가 다르면 시행을 나누는 방식이 달라 결과도 다르므로 키에 넣는다.
+    return (experiment, distribution, int(n_trials), int(seed), int(n_workers))
+
+
+class SimulationCache:
+    """시드 고정 실행의 도수 벡터를 보관하는 스레드 안전 LRU 캐시.
+
+    값은 읽기 전용 배열로 저장해 여러 세션이 복사 없이 같이 쓴다. 같은 키를 여러 스레드가
+    동시에 요청하면 하나만 계산하고 나머지는 기다렸다가 결과를 받는다.
+    """
+
+    def __init__(self, max_bytes=SIM_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (counts, nbytes)
+        self._building = {}            # key -> threading.Event
+        self._lock = threading.Lock()
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def get_or_compute(self, key, compute):
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[0]
+                event = self._building.get(key)
+                if event is None:
+                    event = self._building[key] = threading.Event()
+                    self.misses += 1
+                    break
+            # 다른 세션이 같은 실행을 계산하는 중이면 끝날 때까지 기다렸다가 다시 찾는다.
+            event.wait()
+
+        try:
+            counts = np.array(compute(), dtype=np.int64)
+            counts.flags.writeable = False
+            self._put(key, counts, counts.nbytes + SIM_CACHE_ENTRY_OVERHEAD)
+        finally:
+            with self._lock:
+                del self._building[key]
+            event.set()
+        return counts
+
+    def _put(self, key, counts, nbytes):
+        with self._lock:
+            if nbytes > self.max_bytes:
+                return
+            self._entries[key] = (counts, nbytes)
+            self.total_bytes += nbytes
+            while self.total_bytes > self.max_bytes:
+                _, (_, evicted_bytes) = self._entries.popitem(last=False)
+                self.total_bytes -= evicted_bytes
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.total_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+SIM_CACHE = SimulationCache()
+
+
+# -----------------------------------
+# 스트리밍 실행 (배치별 중간 결과 + 수렴 곡선)
+# -----------------------------------
+# 첫 배치는 작게 시작해 곧바로 결과를 보여 주고, 이후 배치는 두 배씩 키운다.
+STREAM_FIRST_BATCH = 10_000
+STREAM_MAX_BATCH = 1 << 23
+# 수렴 곡선에 기록할 최대 점 개수 (시행 횟수가 아무리 커도 이 이상 보내지 않음)
+STREAM_MAX_POINTS = 400
+
+
+def convergence_checkpoints(n_trials, max_points=STREAM_MAX_POINTS):
+    # 1..n_trials 사이를 로그 간격으로 나눈 시행 번호. 마지막 시행은 항상 포함한다.
+    points = np.geomspace(1, n_trials, num=min(max_points, int(n_trials)))
+    points = np.unique(np.round(points).astype(np.int64))
+    points[-1] = n_trials
+    return points
+
+
+def stream_counts(n_outcomes, n_trials, rng=None, first_batch=STREAM_FIRST_BATCH,
+                  max_batch=STREAM_MAX_BATCH, max_points=STREAM_MAX_POINTS,
+                  chunk_size=SIM_CHUNK_SIZE):
+    """시행을 배치 단위로 나눠 실행하며 배치마다 중간 결과를 내보내는 제너레이터.
+
+    (완료된 시행 수, 누적 도수, 이번 배치의 체크포인트 시행 번호, 그 시점의 상대도수 행렬)을
+    yield한다. 체크포인트는 convergence_checkpoints로 미리 정해 두므로 수렴 곡선의 점 개수는
+    시행 횟수와 무관하게 max_points 이하로 유지된다. 난수는 simulate_counts와 같은 청크로 뽑으므로
+    같은 rng(시드)와 chunk_size면 최종 도수가 simulate_counts와 같다.
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    n_trials = int(n_trials)
+    checkpoints = convergence_checkpoints(n_trials, max_points)
+    counts = np.zeros(n_outcomes, dtype=np.int64)
+    dtype = draw_dtype(n_outcomes)
+    draws = np.empty(0, dtype=dtype)
+    drawn = 0  # 지금까지 뽑은 시행 수 (draws는 시행 drawn - len(draws) .. drawn - 1)
+    done = 0
+    cp_i = 0
+    batch = first_batch
+
+    while done < n_trials:
+        batch_end = min(done + batch, n_trials)
+        xs = []
+        ys = []
+        while done < batch_end:
+            if done == drawn:
+                # simulate_counts와 같은 경계(chunk_size씩)로 뽑아야 같은 난수 생성기에서 같은 결과가
+                # 나온다. 배치 경계는 청크 안에서 자르고, 남은 표본은 다음 배치에서 이어 쓴다.
+                draws = rng.integers(0, n_outcomes, size=min(chunk_size, n_trials - drawn), dtype=dtype)
+                drawn += len(draws)
+            base = drawn - len(draws)
+            chunk_end = min(drawn, batch_end)
+            # 청크 안의 체크포인트마다 구간별 도수를 더해 그 시점의 누적 도수를 기록한다.
+            pos = done - base
+            while cp_i < len(checkpoints) and checkpoints[cp_i] <= chunk_end:
+                cp = int(checkpoints[cp_i]) - base
+                counts += np.bincount(draws[pos:cp], minlength=n_outcomes)
+                pos = cp
+                xs.append(base + cp)
+                ys.append(counts / (base + cp))
+                cp_i += 1
+            counts += np.bincount(draws[pos:chunk_end - base], minlength=n_outcomes)
+            done = chunk_end
+
+        yield (
+            done,
+            counts.copy(),
+            np.asarray(xs, dtype=np.int64),
+            np.asarray(ys, dtype=np.float64).reshape(-1, n_outcomes),
+        )
+        batch = min(batch * 2, max_batch)
+
+
+# =============================================================================
+# 사용자 정의 범주형 실험 (Walker/Vose 별칭 표 샘플링)
+# =============================================================================
+@functools.lru_cache(maxsize=64)
+def build_alias_table(probs):
+    """확률 벡터로 Vose 별칭 표 (accept, alias)를 만든다. probs는 캐시 키가 되도록 튜플로 넘긴다.
+
+    칸 i를 균등하게 고른 뒤 균등 난수 u < accept[i] 이면 i, 아니면 alias[i]를 결과로 한다.
+    표는 분포마다 한 번 O(n)에 만들고, 이후 표본 하나는 결과 개수와 무관하게 O(1)이다.
+    """
+    p = np.asarray(probs, dtype=np.float64)
+    n = len(p)
+    scaled = p * (n / p.sum())
+    accept = np.ones(n)
+    alias = np.arange(n)
+    small = [i for i in range(n) if scaled[i] < 1.0]
+    large = [i for i in range(n) if scaled[i] >= 1.0]
+    while small and large:
+        s = small.pop()
+        g = large.pop()
+        accept[s] = scaled[s]
+        alias[s] = g
+        # 큰 칸 g가 작은 칸 s의 빈자리를 채우고 남은 몫
+        scaled[g] -= 1.0 - scaled[s]
+        (small if scaled[g] < 1.0 else large).append(g)
+    # 남은 칸은 부동소수점 오차를 무시하고 자기 자신으로 채운다. (accept = 1)
+    accept.flags.writeable = False
+    alias.flags.writeable = False
+    return accept, alias
+
+
+def sample_alias(table, size, rng):
+    # 별칭 표에서 size개를 한 번에 뽑는다. (칸 고르기 + 균등 난수 한 번씩)
+    accept, alias = table
+    idx = rng.integers(0, len(accept), size=size)
+    return np.where(rng.random(size) < accept[idx], idx, alias[idx])
+
+
+def simulate_categorical_counts(probs, n_trials, rng=None, chunk_size=SIM_CHUNK_SIZE):
+    """결과별 확률 probs로 n_trials번 뽑아 결과별 도수 벡터를 반환한다. (별칭 표 사용)"""
+    rng = np.random.default_rng() if rng is None else rng
+    table = build_alias_table(tuple(np.asarray(probs, dtype=np.float64)))
+    counts = np.zeros(len(table[0]), dtype=np.int64)
+    remaining = int(n_trials)
+    while remaining > 0:
+        size = min(chunk_size, remaining)
+        counts += np.bincount(sample_alias(table, size, rng), minlength=len(counts))
+        remaining -= size
+    return counts
+
+
+def _simulate_categorical_part(probs, n_trials, seed_seq, chunk_size):
+    return simulate_categorical_counts(probs, n_trials, np.random.default_rng(seed_seq), chunk_size)
+
+
+def simulate_categorical_counts_seeded(probs, n_trials, seed, n_workers=1, executor=None,
+                                       chunk_size=SIM_CHUNK_SIZE):
+    # simulate_counts_seeded와 같은 방식으로 작업자별 독립 시드를 써서 재현 가능하게 계산한다.
+    return _run_seeded(
+        _simulate_categorical_part, (np.asarray(probs), chunk_size), n_trials, seed, n_workers, executor
+    )
+
+
+# =============================================================================
+# 여러 주사위의 합 (시뮬레이션 + 합성곱으로 구한 정확한 분포)
+# =============================================================================
+# 두 벡터 길이가 모두 이보다 길면 합성곱을 FFT로 계산한다.
+CONV_FFT_MIN_SIZE = 64
+
+
+def face_probabilities(n_faces, weights=None):
+    # 면별 확률 벡터. weights를 주지 않으면 공정한 주사위.
+    if weights is None:
+        return np.full(n_faces, 1.0 / n_faces)
+    probs = np.asarray(weights, dtype=np.float64)
+    if probs.shape != (n_faces,) or (probs < 0).any() or probs.sum() <= 0:
+        raise ValueError(f"가중치는 0 이상인 수 {n_faces}개여야 합니다.")
+    return probs / probs.sum()
+
+
+def sum_draws_per_trial(n_dice, n_faces):
+    # simulate_sum_counts가 시행 한 번에 만드는 난수 개수. (다항분포면 면 수, 아니면 주사위 개수)
+    return min(n_dice, n_faces)
+
+
+def simulate_sum_counts(n_dice, probs, n_trials, rng=None, chunk_size=SIM_CHUNK_SIZE):
+    """주사위 n_dice개(면별 확률 probs)를 n_trials번 던져 눈의 합별 도수 벡터를 반환한다.
+
+    합은 (눈 - 1)의 합으로 세므로 도수 벡터의 i번째 값은 합이 n_dice + i 인 횟수다.
+    주사위가 면 수보다 많으면 (공정하든 아니든) 면별 개수를 다항분포로 한 번에 뽑고, 적으면
+    공정한 주사위는 눈을 직접, 가중 주사위는 별칭 표로 뽑아 더한다. 시행당 비용은
+    O(min(주사위 개수, 면 수)) 이다. (sum_draws_per_trial)
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    probs = np.asarray(probs, dtype=np.float64)
+    n_faces = len(probs)
+    faces = np.arange(n_faces)
+    use_multinomial = n_dice >= n_faces
+    fair = not use_multinomial and np.allclose(probs, 1.0 / n_faces)
+    table = None if fair or use_multinomial else build_alias_table(tuple(probs))
+
+    # 한 청크에서 만드는 난수 개수가 chunk_size 정도가 되도록 행(시행) 수를 정한다.
+    rows = max(1, chunk_size // sum_draws_per_trial(n_dice, n_faces))
+    counts = np.zeros(n_dice * (n_faces - 1) + 1, dtype=np.int64)
+    remaining = int(n_trials)
+    while remaining > 0:
+        size = min(rows, remaining)
+        if use_multinomial:
+            sums = rng.multinomial(n_dice, probs, size=size) @ faces
+        elif fair:
+            sums = rng.integers(0, n_faces, size=(size, n_dice), dtype=draw_dtype(n_faces)).sum(axis=1, dtype=np.int64)
+        else:
+            sums = sample_alias(table, (size, n_dice), rng).sum(axis=1)
+        counts += np.bincount(sums, minlength=len(counts))
+        remaining -= size
+    return counts
+
+
+def _simulate_sum_part(n_dice, probs, n_trials, seed_seq, chunk_size):
+    return simulate_sum_counts(n_dice, probs, n_trials, np.random.default_rng(seed_seq), chunk_size)
+
+
+def simulate_sum_counts_seeded(n_dice, probs, n_trials, seed, n_workers=1, executor=None,
+                               chunk_size=SIM_CHUNK_SIZE):
+    # simulate_counts_seeded와 같은 방식으로 작업자별 독립 시드를 써서 재현 가능하게 계산한다.
+    return _run_seeded(
+        _simulate_sum_part, (n_dice, np.asarray(probs), chunk_size), n_trials, seed, n_workers, executor
+    )
+
+
+def _convolve(a, b):
+    # 짧으면 직접 합성곱, 길면 FFT. FFT 반올림 오차로 생긴 작은 음수는 0으로 자른다.
+    if min(len(a), len(b)) < CONV_FFT_MIN_SIZE:
+        return np.convolve(a, b)
+    n = len(a) + len(b) - 1
+    out = np.fft.irfft(np.fft.rfft(a, n) * np.fft.rfft(b, n), n)
+    return np.clip(out, 0.0, None)
+
+
+@functools.lru_cache(maxsize=64)
+def exact_sum_distribution(n_dice, probs):
+    """주사위 n_dice개의 눈의 합의 정확한 분포 (i번째 값 = 합이 n_dice + i 일 확률).
+
+    k^m 가지 경우를 나열하지 않고, 한 개의 분포를 거듭제곱하듯 제곱-곱하기로 합성곱한다.
+    (합성곱 log2(m)번 정도, 길이가 길어지면 FFT) probs는 캐시 키가 되도록 튜플로 넘긴다.
+    """
+    base = np.asarray(probs, dtype=np.float64)
+    result = np.ones(1)
+    power = n_dice
+    while power:
+        if power & 1:
+            result = _convolve(result, base)
+        power >>= 1
+        if power:
+            base = _convolve(base, base)
+    result = result / result.sum()
+    result.flags.writeable = False
+    return result
+
+
+def chi_square_test(observed, probs, min_expected=5.0):
+    """관측 도수와 이론 확률의 카이제곱 적합도 검정. {statistic, dof, p_value, n_bins}를 돌려준다.
+
+    기대도수가 min_expected보다 작은 구간(주로 양쪽 꼬리)은 하나로 합쳐 계산한다.
+    p-값은 카이제곱 분포의 Wilson–Hilferty 정규 근사로 구한다.
+    """
+    observed = np.asarray(observed, dtype=np.float64)
+    expected = np.asarray(probs, dtype=np.float64) * observed.sum()
+    keep = expected >= min_expected
+    obs = observed[keep]
+    exp = expected[keep]
+    if (~keep).any():
+        obs = np.append(obs, observed[~keep].sum())
+        exp = np.append(exp, expected[~keep].sum())
+    # 합친 꼬리 구간까지 기대도수가 0인 칸은 통계량에서 뺀다.
+    nonzero = exp > 0
+    obs, exp = obs[nonzero], exp[nonzero]
+
+    statistic = float(((obs - exp) ** 2 / exp).sum())
+    dof = len(obs) - 1
+    if dof < 1:
+        return {"statistic": statistic, "dof": dof, "p_value": float("nan"), "n_bins": len(obs)}
+    z = ((statistic / dof) ** (1 / 3) - (1 - 2 / (9 * dof))) / math.sqrt(2 / (9 * dof))
+    p_value = 0.5 * math.erfc(z / math.sqrt(2))
+    return {"statistic": statistic, "dof": dof, "p_value": p_value, "n_bins": len(obs)}
+
+
+# =============================================================================
+# 동전 던지기 비트 압축 저장 + 연속 기록(런) 통계
+# =============================================================================
+# 던지기 결과를 1비트(1 = 앞면)씩 np.uint8 배열에 담는다. 10^9번이면 약 125 MB.
+# 통계는 압축 배열을 PACKED_CHUNK_BYTES씩 풀어 가며 계산하고, 조각 경계에 걸친 런은 이어 붙인다.
+PACKED_CHUNK_BYTES = 1 << 20
+
+
+def simulate_packed_flips(n_trials, rng=None, chunk_bytes=PACKED_CHUNK_BYTES):
+    """공정한 동전을 n_trials번 던진 결과를 비트 압축 배열로 돌려준다. (길이 ceil(n/8) bytes)
+
+    무작위 바이트 하나가 곧 독립인 던지기 8번이므로 풀거나 비교하는 과정 없이 바로 채운다.
+    마지막 바이트의 남는 비트는 0으로 지운다.
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    n_trials = int(n_trials)
+    packed = np.empty((n_trials + 7) // 8, dtype=np.uint8)
+    for start in range(0, len(packed), chunk_bytes):
+        stop = min(start + chunk_bytes, len(packed))
+        packed[start:stop] = rng.integers(0, 256, size=stop - start, dtype=np.uint8)
+    if n_trials % 8:
+        packed[-1] &= np.uint8((0xFF << (8 - n_trials % 8)) & 0xFF)
+    return packed
+
+
+def run_statistics(packed, n_trials, chunk_bytes=PACKED_CHUNK_BYTES):
+    """비트 압축 배열에서 앞면 수, 런 개수, 최장 런, 런 길이 히스토그램을 계산한다.
+
+    histogram[L]은 길이가 정확히 L인 런 개수(앞면/뒷면 합)이고, longest는 {1: 앞면, 0: 뒷면}별
+    최장 런 길이다. 조각마다 값이 바뀌는 위치만 찾아 길이를 구한다. 런의 값은 앞면/뒷면이
+    번갈아 나오므로 첫 런의 값과 순서(짝/홀)만으로 정해진다.
+    """
+    n_trials = int(n_trials)
+    n_bytes = (n_trials + 7) // 8
+    # 앞면 수는 바이트별 1비트 개수의 합 (마지막 바이트의 남는 비트는 빼고 센다)
+    heads = int(np.bitwise_count(packed[:n_trials // 8]).sum())
+    if n_trials % 8:
+        heads += int(np.bitwise_count(packed[n_bytes - 1] >> (8 - n_trials % 8)))
+    histogram = np.zeros(2, dtype=np.int64)
+    longest = {0: 0, 1: 0}
+    n_runs = 0
+    # 직전 조각 끝에서 아직 끝나지 않은 런 (값, 길이)
+    carry_value, carry_len = None, 0
+
+    def close_runs(first_value, lengths):
+        # lengths[0]의 값이 first_value이고 이후로는 값이 번갈아 나온다.
+        nonlocal histogram, n_runs
+        if not len(lengths):
+            return
+        top = int(lengths.max())
+        if top >= len(histogram):
+            histogram = np.concatenate([histogram, np.zeros(top + 1 - len(histogram), np.int64)])
+        histogram += np.bincount(lengths, minlength=len(histogram))
+        n_runs += len(lengths)
+        longest[first_value] = max(longest[first_value], int(lengths[0::2].max()))
+        if len(lengths) > 1:
+            longest[1 - first_value] = max(longest[1 - first_value], int(lengths[1::2].max()))
+
+    for start in range(0, n_bytes, chunk_bytes):
+        bits = np.unpackbits(packed[start:min(start + chunk_bytes, n_bytes)])
+        bits = bits[:n_trials - start * 8]
+
+        # 런 경계 = 앞 비트와 값이 다른 위치. 길이는 경계 사이 간격이다.
+        edges = np.flatnonzero(bits[1:] != bits[:-1])
+        lengths = np.empty(len(edges) + 1, dtype=np.int64)
+        if len(edges):
+            lengths[0] = edges[0] + 1
+            lengths[1:-1] = np.diff(edges)
+            lengths[-1] = len(bits) - 1 - edges[-1]
+        else:
+            lengths[0] = len(bits)
+        first_value = int(bits[0])
+
+        if carry_value is not None:
+            if first_value == carry_value:
+                lengths[0] += carry_len
+            else:
+                close_runs(carry_value, np.array([carry_len]))
+        # 마지막 런은 다음 조각으로 이어질 수 있으므로 미뤄 둔다.
+        last_value = first_value ^ ((len(lengths) - 1) & 1)
+        close_runs(first_value, lengths[:-1])
+        carry_value, carry_len = last_value, int(lengths[-1])
+
+    if carry_value is not None:
+        close_runs(carry_value, np.array([carry_len]))
+    return {"heads": heads, "n_runs": n_runs, "longest": longest, "histogram": histogram}
+
+
+def expected_runs(n_trials):
+    # 공정한 동전 n번에서 런 개수의 평균과 표준편차: (n + 1) / 2, sqrt((n - 1) / 4)
+    return (n_trials + 1) / 2, math.sqrt(max(n_trials - 1, 0) / 4)
+
+
+def expected_run_histogram(n_trials, max_len):
+    """공정한 동전 n번에서 길이가 정확히 L인 런 개수의 기댓값 (L = 0..max_len, 0번 칸은 0).
+
+    L < n 이면 (n - L + 3) / 2^(L+1), L = n 이면 1 / 2^(n-1).
+    """
+    lengths = np.arange(max_len + 1, dtype=np.float64)
+    expected = (n_trials - lengths + 3) / 2.0 ** (lengths + 1)
+    expected[0] = 0.0
+    expected[lengths > n_trials] = 0.0
+    if max_len >= n_trials:
+        expected[n_trials] = 2.0 ** -(n_trials - 1)
+    return expected
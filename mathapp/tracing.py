@@ -0,0 +1,281 @@
+import contextvars
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# =============================================================================
+# 스크립트 실행별 시간 구간 (span)
+# =============================================================================
+# 스크립트 한 번 실행(또는 fragment만 다시 실행)을 RunTrace 하나로 보고, 그 안의 단계
+# (CSS, 데이터 로드, 구간화, 그림 생성, 직렬화 ...)를 span으로 잰다. 실행 중인 RunTrace는
+# ContextVar에 두므로 세션마다 따로 쌓이고, 실행 중이 아닐 때의 span은 아무것도 하지 않는다.
+# 끝난 실행은 등록된 listener(디버그 패널, JSON lines, Prometheus 파일)로 넘긴다.
+TRACE_JSONL_ENV = "MATHAPP_TRACE_JSONL"
+TRACE_PROM_ENV = "MATHAPP_TRACE_PROM"
+TRACE_JSONL_MAX_BYTES = 5 * 1024 * 1024
+TRACE_JSONL_BACKUPS = 3
+
+_current_run = contextvars.ContextVar("mathapp_current_run", default=None)
+RUN_LISTENERS = []
+
+
+def rss_bytes():
+    # 현재 상주 메모리(RSS). /proc가 없는 OS에서는 None.
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def peak_rss_bytes():
+    # 프로세스가 시작된 뒤 가장 컸던 RSS. (프로세스 전체 값이라 줄어들지 않는다)
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class RunTrace:
+    """스크립트 실행 한 번의 단계별 시간과 태그 (app_mode, year, n_trials ...)."""
+
+    def __init__(self, kind, **tags):
+        self.kind = kind
+        self.tags = {}
+        self.spans = []
+        self.started_at = time.time()
+        self.rss_start = rss_bytes()
+        self.seconds = None
+        self.rss_end = None
+        self.rss_delta = None
+        self.process_peak_rss = None
+        self._t0 = time.perf_counter()
+        self.tag(**tags)
+
+    def tag(self, **tags):
+        self.tags.update({k: v for k, v in tags.items() if v is not None})
+
+    def add_span(self, name, seconds, **tags):
+        self.spans.append({"stage": name, "seconds": seconds, **{k: v for k, v in tags.items() if v is not None}})
+
+    def finish(self):
+        self.seconds = time.perf_counter() - self._t0
+        self.rss_end = rss_bytes()
+        # 이 실행 동안의 RSS 변화량. 실행 중 최댓값은 따로 잴 방법이 없어 시작/끝 차이만 기록한다.
+        if None not in (self.rss_start, self.rss_end):
+            self.rss_delta = self.rss_end - self.rss_start
+        # 프로세스 전체의 최대 RSS. (이 실행만의 값이 아니며 줄어들지 않는다)
+        # getrusage와 /proc 값은 재는 시점이 달라 방금 잰 RSS보다 조금 작게 나올 수 있다.
+        peak = peak_rss_bytes()
+        self.process_peak_rss = max(peak, self.rss_end) if None not in (peak, self.rss_end) else peak
+
+    def to_record(self):
+        return {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S%z", time.localtime(self.started_at)),
+            "kind": self.kind,
+            "seconds": self.seconds,
+            "tags": self.tags,
+            "spans": self.spans,
+            "rss_start": self.rss_start,
+            "rss_end": self.rss_end,
+            "rss_delta": self.rss_delta,
+            "process_peak_rss": self.process_peak_rss,
+        }
+
+
+def current_run():
+    return _current_run.get()
+
+
+def start_run(kind, **tags):
+    # 새 실행을 시작한다. 이전 실행이 예외로 끝나 남아 있더라도 새 것으로 바꾼다.
+    trace = RunTrace(kind, **tags)
+    _current_run.set(trace)
+    return trace
+
+
+def finish_run(trace):
+    if _current_run.get() is trace:
+        _current_run.set(None)
+    trace.finish()
+    for listener in list(RUN_LISTENERS):
+        listener(trace)
+
+
+@contextmanager
+def traced_run(kind, **tags):
+    """실행 중인 RunTrace가 없을 때만 새 실행으로 잰다.
+
+    fragment 함수에 쓰면 전체 실행 안에서는 그 실행의 일부로(tags는 붙이지 않음), fragment만
+    다시 실행될 때는 tags를 단 따로 하나의 실행으로 기록된다. (contextmanager라 데코레이터로도 쓸 수 있다)
+    """
+    trace = _current_run.get()
+    if trace is not None:
+        yield trace
+        return
+    trace = start_run(kind, **tags)
+    try:
+        yield trace
+    finally:
+        finish_run(trace)
+
+
+@contextmanager
+def span(name, **tags):
+    # 실행 중인 RunTrace에 단계 하나의 시간을 기록한다. 값이 None인 태그는 뺀다.
+    trace = _current_run.get()
+    if trace is None:
+        yield
+        return
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.add_span(name, time.perf_counter() - t0, **tags)
+
+
+def tag(**tags):
+    # 실행 중인 RunTrace에 태그를 붙인다. (예: tag(year=2020), tag(n_trials=100000))
+    trace = _current_run.get()
+    if trace is not None:
+        trace.tag(**tags)
+
+
+# =============================================================================
+# 내보내기 (JSON lines / Prometheus 텍스트 파일)
+# =============================================================================
+class JsonLinesExporter:
+    """끝난 실행을 한 줄에 하나씩 JSON으로 쓴다.
+
+    파일이 max_bytes를 넘으면 path.1, path.2 ... 로 밀어내고 새 파일에 쓴다. (backups개까지 보관)
+    """
+
+    def __init__(self, path, max_bytes=TRACE_JSONL_MAX_BYTES, backups=TRACE_JSONL_BACKUPS):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._lock = threading.Lock()
+
+    def _rotate(self):
+        for i in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{i}"):
+                os.replace(f"{self.path}.{i}", f"{self.path}.{i + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+    def __call__(self, trace):
+        line = json.dumps(trace.to_record(), ensure_ascii=False, default=str) + "\n"
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+                size = f.tell()
+            if size >= self.max_bytes:
+                self._rotate()
+
+
+# 실행 시간 히스토그램 구간 (초)
+PROM_RUN_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _prom_labels(**labels):
+    def escape(value):
+        return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return "{" + ",".join(f'{k}="{escape(v)}"' for k, v in labels.items()) + "}"
+
+
+class PrometheusTextExporter:
+    """실행/단계별 누적 시간을 Prometheus 텍스트 형식 파일로 쓴다. (node_exporter textfile 수집기용)
+
+    실행이 끝날 때마다 누적값을 갱신하고 파일 전체를 임시 파일에 쓴 뒤 교체하므로,
+    수집기가 반쯤 쓰인 파일을 읽지 않는다. 값은 프로세스가 시작된 뒤의 누적값이다.
+    """
+
+    def __init__(self, path, buckets=PROM_RUN_BUCKETS):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.buckets = buckets
+        self._runs = {}    # (kind, app_mode) -> [bucket counts..., count, sum]
+        self._stages = {}  # (stage, app_mode) -> [count, seconds, bytes]
+        self._lock = threading.Lock()
+
+    def __call__(self, trace):
+        app_mode = trace.tags.get("app_mode", "")
+        with self._lock:
+            run = self._runs.setdefault((trace.kind, app_mode), [0] * (len(self.buckets) + 2))
+            for i, bound in enumerate(self.buckets):
+                if trace.seconds <= bound:
+                    run[i] += 1
+            run[-2] += 1
+            run[-1] += trace.seconds
+            for s in trace.spans:
+                stage = self._stages.setdefault((s["stage"], app_mode), [0, 0.0, 0])
+                stage[0] += 1
+                stage[1] += s["seconds"]
+                stage[2] += s.get("bytes", 0)
+            text = self._render(trace)
+            tmp_fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.path)), suffix=".tmp")
+            with os.fdopen(tmp_fd, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_path, self.path)
+
+    def _render(self, trace):
+        lines = [
+            "# HELP mathapp_run_seconds Streamlit script run duration.",
+            "# TYPE mathapp_run_seconds histogram",
+        ]
+        for (kind, app_mode), run in sorted(self._runs.items()):
+            for bound, count in zip(self.buckets, run):
+                lines.append(f"mathapp_run_seconds_bucket{_prom_labels(kind=kind, app_mode=app_mode, le=bound)} {count}")
+            lines.append(f"mathapp_run_seconds_bucket{_prom_labels(kind=kind, app_mode=app_mode, le='+Inf')} {run[-2]}")
+            lines.append(f"mathapp_run_seconds_count{_prom_labels(kind=kind, app_mode=app_mode)} {run[-2]}")
+            lines.append(f"mathapp_run_seconds_sum{_prom_labels(kind=kind, app_mode=app_mode)} {run[-1]:.6f}")
+
+        metrics = (
+            ("mathapp_stage_calls_total", "counter", "Stage executions.", 0, "d"),
+            ("mathapp_stage_seconds_total", "counter", "Time spent in each stage.", 1, ".6f"),
+            ("mathapp_stage_payload_bytes_total", "counter", "Serialized bytes sent by each stage.", 2, "d"),
+        )
+        for name, kind, help_text, i, fmt in metrics:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+            for (stage, app_mode), values in sorted(self._stages.items()):
+                lines.append(f"{name}{_prom_labels(stage=stage, app_mode=app_mode)} {values[i]:{fmt}}")
+
+        for name, help_text, value in (
+            ("mathapp_process_resident_bytes", "Resident memory after the last run.", trace.rss_end),
+            ("mathapp_process_peak_resident_bytes", "Peak resident memory of the process.", trace.process_peak_rss),
+        ):
+            if value is not None:
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge", f"{name} {value}"]
+        return "\n".join(lines) + "\n"
+
+
+def add_run_listener(listener):
+    if listener not in RUN_LISTENERS:
+        RUN_LISTENERS.append(listener)
+
+
+_configured_paths = set()
+
+
+def configure_from_env():
+    """MATHAPP_TRACE_JSONL / MATHAPP_TRACE_PROM 환경 변수에 경로가 있으면 내보내기를 켠다.
+
+    여러 번 불러도 경로마다 한 번만 등록된다.
+    """
+    for env, exporter in ((TRACE_JSONL_ENV, JsonLinesExporter), (TRACE_PROM_ENV, PrometheusTextExporter)):
+        path = os.environ.get(env)
+        if path and (env, path) not in _configured_paths:
+            _configured_paths.add((env, path))
+            add_run_listener(exporter(path))
@@ -0,0 +1,4 @@
+"""앱별 Streamlit 화면. 각 모듈의 render()가 한 화면을 그린다.
+
+모듈마다 필요한 라이브러리만 import하므로, 선택하지 않은 앱의 pandas/plotly 로딩 비용은 들지 않는다.
+"""
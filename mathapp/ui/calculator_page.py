@@ -0,0 +1,511 @@
+"""계산기 화면 (사칙/모듈러/지수/로그/일괄/수식).
+
+main.py가 계산기 모드일 때만 import한다. pandas는 수식 계산 표에서만 필요하므로
+해당 분기 안에서 불러온다. (일괄 계산은 mathapp.calculator가 필요할 때 불러온다)
+"""
+
+import math
+
+import numpy as np
+import streamlit as st
+
+from ..calculator import (
+    BATCH_OPERATIONS,
+    BATCH_PREVIEW_ROWS,
+    ERROR_MESSAGES,
+    ExpressionError,
+    OperandError,
+    batch_frame,
+    compile_expression,
+    error_summary,
+    evaluate_batch,
+    iter_batch_csv,
+    operand_column,
+    parse_operands,
+    parse_values,
+)
+from ..number_theory import (
+    NT_TIME_BUDGET,
+    BudgetExceeded,
+    NumberTheoryError,
+    crt,
+    exact_power,
+    factorize,
+    format_int,
+    is_probable_prime,
+    mod_inverse,
+    mod_pow,
+    parse_int,
+)
+from ..tracing import span, tag, traced_run
+
+# =============================================================================
+# 0-2. 계산기 보조 함수
+# =============================================================================
+def render_calc_display(slot):
+    # 계산기 디스플레이. 결과를 바꾼 뒤 다시 호출하면 st.rerun() 없이 바로 갱신된다.
+    slot.markdown(
+        f"""
+        <div class="calc-display">
+            <div class="calc-display-label">RESULT</div>
+            <div class="calc-display-value">{st.session_state.display_text}</div>
+        </div>
+        """,
+        unsafe_allow_html=True
+    )
+
+
+def time_budget_input(key):
+    """정수론 연산과 정확한 거듭제곱이 함께 쓰는 시간 제한 입력. 초 단위로 돌려준다.
+
+    계산 모드를 바꾸면 보이지 않는 위젯의 값은 지워지므로, 마지막 값을 따로 기억해 두었다가
+    다른 모드의 같은 입력에 기본값으로 쓴다.
+    """
+    budget_ms = st.number_input(
+        "시간 제한 (ms)", min_value=10, max_value=60_000,
+        value=st.session_state.get("nt_budget_ms", int(NT_TIME_BUDGET * 1000)), step=100, key=key
+    )
+    st.session_state.nt_budget_ms = budget_ms
+    return budget_ms / 1000
+
+
+
+# =============================================================================
+# 1. 계산기 앱
+# =============================================================================
+def render():
+    """계산기 화면."""
+
+    # 계산기 내부 모드 (사칙/모듈러/지수/로그/일괄/수식)
+    calc_mode = st.sidebar.radio(
+        "계산 모드 선택",
+        ("사칙연산", "모듈러 연산", "지수 연산", "로그 연산", "일괄 계산", "수식 계산")
+    )
+    tag(calc_mode=calc_mode)
+
+    # 계산기 카드는 fragment로 묶어, 입력/버튼을 조작하면 카드 부분만 다시 실행한다.
+    # (사이드바 위젯은 fragment 안에서 만들 수 없으므로 계산 모드 선택은 밖에 둔다)
+    @st.fragment
+    @traced_run("fragment", app_mode="계산기", section="calculator")
+    def calculator_card(calc_mode):
+        # 계산기 카드 시작
+        st.markdown('<div class="calculator-container">', unsafe_allow_html=True)
+
+        # 디스플레이 영역 (계산 결과가 나오면 같은 실행 안에서 이 자리를 다시 그린다)
+        display_slot = st.empty()
+        render_calc_display(display_slot)
+
+        # 모드 태그
+        st.markdown(f'<div class="calc-mode-tag">{calc_mode}</div>', unsafe_allow_html=True)
+
+        # -------------------------------
+        # 1-1. 사칙연산
+        # -------------------------------
+        if calc_mode == "사칙연산":
+            st.markdown(
+                """
+                <div class="calc-section">
+                    <div class="calc-section-title">사칙연산 설정</div>
+                    <div class="calc-section-caption">두 수를 입력하고 원하는 연산을 선택하세요.</div>
+                </div>
+                """,
+                unsafe_allow_html=True
+            )
+
+            with st.container():
+                col1, col2 = st.columns(2)
+                with col1:
+                    a = st.number_input("첫 번째 수 (a)", value=0.0, format="%.6f", key="basic_a")
+                with col2:
+                    b = st.number_input("두 번째 수 (b)", value=0.0, format="%.6f", key="basic_b")
+
+                op = st.radio(
+                    "연산 선택",
+                    ("더하기 (a + b)", "빼기 (a - b)", "곱하기 (a × b)", "나누기 (a ÷ b)"),
+                    horizontal=True
+                )
+
+                if st.button("계산하기", key="basic_calc"):
+                    if op == "더하기 (a + b)":
+                        result = a + b
+                        expr = f"{a} + {b} = {result}"
+                    elif op == "빼기 (a - b)":
+                        result = a - b
+                        expr = f"{a} - {b} = {result}"
+                    elif op == "곱하기 (a × b)":
+                        result = a * b
+                        expr = f"{a} × {b} = {result}"
+                    else:  # 나누기
+                        if b == 0:
+                            st.error("0으로는 나눌 수 없습니다. (b ≠ 0)")
+                            expr = "Error: divide by 0"
+                        else:
+                            result = a / b
+                            expr = f"{a} ÷ {b} = {result}"
+
+                    st.session_state.display_text = expr
+                    render_calc_display(display_slot)
+
+        # -------------------------------
+        # 1-2. 모듈러 연산
+        # -------------------------------
+        elif calc_mode == "모듈러 연산":
+            st.markdown(
+                """
+                <div class="calc-section">
+                    <div class="calc-section-title">모듈러 연산 설정</div>
+                    <div class="calc-section-caption">a mod n, 모듈러 거듭제곱/역원, 중국인의 나머지 정리, 소수 판정, 소인수분해를 계산합니다.</div>
+                </div>
+                """,
+                unsafe_allow_html=True
+            )
+
+            with st.container():
+                nt_op = st.radio(
+                    "연산 종류",
+                    ("a mod n", "a^b mod n", "모듈러 역원", "중국인의 나머지 정리", "소수 판정", "소인수분해"),
+                    horizontal=True,
+                    key="nt_op"
+                )
+                st.caption("※ 큰 정수도 정확하게 계산합니다. 10진수, 0x16진수, 2^521-1 같은 꼴로 입력할 수 있습니다.")
+
+                inputs = {}
+                if nt_op == "중국인의 나머지 정리":
+                    inputs["r"] = st.text_input("나머지 r₁, r₂, … (쉼표로 구분)", value="2, 3, 2", key="nt_crt_r")
+                    inputs["m"] = st.text_input("법 m₁, m₂, … (쉼표로 구분)", value="3, 5, 7", key="nt_crt_m")
+                elif nt_op in ("소수 판정", "소인수분해"):
+                    inputs["n"] = st.text_input("정수 (n)", value="600851475143", key="nt_n_only")
+                else:
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        inputs["a"] = st.text_input("a", value="17", key="nt_a")
+                    if nt_op == "a^b mod n":
+                        with col2:
+                            inputs["b"] = st.text_input("지수 (b)", value="65537", key="nt_b")
+                    inputs["n"] = st.text_input("법 (n, 양의 정수)", value="3233", key="nt_n")
+
+                budget = time_budget_input("nt_budget")
+
+                if st.button("계산하기", key="mod_calc"):
+                    try:
+                        if nt_op == "중국인의 나머지 정리":
+                            residues = tuple(parse_int(t) for t in inputs["r"].split(","))
+                            moduli = tuple(parse_int(t) for t in inputs["m"].split(","))
+                            x, lcm = crt(residues, moduli, time_budget=budget)
+                            expr = f"x ≡ {format_int(x)} (mod {format_int(lcm)})"
+                        elif nt_op == "소수 판정":
+                            n = parse_int(inputs["n"])
+                            prime = is_probable_prime(n, time_budget=budget)
+                            expr = f"{format_int(n)} : {'소수' if prime else '합성수'}"
+                        elif nt_op == "소인수분해":
+                            n = parse_int(inputs["n"])
+                            factors = factorize(n, time_budget=budget)
+                            terms = [format_int(p) + (f"^{e}" if e > 1 else "") for p, e in factors.items()]
+                            expr = f"{format_int(n)} = {' × '.join(terms)}"
+                        else:
+                            a = parse_int(inputs["a"])
+                            n = parse_int(inputs["n"])
+                            if nt_op == "a mod n":
+                                if n <= 0:
+                                    raise NumberTheoryError("법 n은 양의 정수여야 합니다.")
+                                expr = f"{format_int(a)} mod {format_int(n)} = {format_int(a % n)}"
+                            elif nt_op == "a^b mod n":
+                                b = parse_int(inputs["b"])
+                                result = mod_pow(a, b, n, time_budget=budget)
+                                expr = f"{format_int(a)}^{format_int(b)} mod {format_int(n)} = {format_int(result)}"
+                            else:
+                                result = mod_inverse(a, n, time_budget=budget)
+                                expr = f"{format_int(a)}⁻¹ mod {format_int(n)} = {format_int(result)}"
+                    except NumberTheoryError as e:
+                        st.error(str(e))
+                        expr = "Error: invalid input"
+                    except BudgetExceeded as e:
+                        st.error(f"{e} 시간 제한을 늘려 다시 시도해 보세요.")
+                        if e.partial and e.partial["factors"]:
+                            found = " × ".join(
+                                format_int(p) + (f"^{k}" if k > 1 else "") for p, k in e.partial["factors"].items()
+                            )
+                            st.caption(f"지금까지 찾은 소인수: {found} (남은 수 {len(e.partial['remaining'])}개)")
+                        expr = "Error: time budget exceeded"
+
+                    st.session_state.display_text = expr
+                    render_calc_display(display_slot)
+
+        # -------------------------------
+        # 1-3. 지수 연산
+        # -------------------------------
+        elif calc_mode == "지수 연산":
+            st.markdown(
+                """
+                <div class="calc-section">
+                    <div class="calc-section-title">지수 연산 설정</div>
+                    <div class="calc-section-caption">a^b 형태의 지수 연산을 계산합니다.</div>
+                </div>
+                """,
+                unsafe_allow_html=True
+            )
+
+            with st.container():
+                exact = st.checkbox("정수로 정확하게 계산 (큰 수)", key="exp_exact")
+                col1, col2 = st.columns(2)
+                if exact:
+                    with col1:
+                        a_text = st.text_input("밑 (a, 정수)", value="2", key="exp_a_int")
+                    with col2:
+                        b_text = st.text_input("지수 (b, 0 이상의 정수)", value="10000", key="exp_b_int")
+                    budget = time_budget_input("exp_budget")
+                else:
+                    with col1:
+                        a = st.number_input("밑 (a)", value=2.0, format="%.6f", key="exp_a")
+                    with col2:
+                        b = st.number_input("지수 (b)", value=3.0, format="%.6f", key="exp_b")
+
+                if st.button("계산하기", key="exp_calc"):
+                    if exact:
+                        try:
+                            a, b = parse_int(a_text), parse_int(b_text)
+                            result = exact_power(a, b, time_budget=budget)
+                            expr = f"{format_int(a)} ^ {format_int(b)} = {format_int(result)}"
+                        except NumberTheoryError as e:
+                            st.error(str(e))
+                            expr = "Error: invalid input"
+                        except BudgetExceeded as e:
+                            st.error(str(e))
+                            expr = "Error: time budget exceeded"
+                    else:
+                        try:
+                            result = a ** b
+                            expr = f"{a} ^ {b} = {result}"
+                        except OverflowError:
+                            st.error("값이 너무 커서 계산할 수 없습니다. (정수라면 '정수로 정확하게 계산'을 켜 보세요)")
+                            expr = "Error: overflow"
+                        except Exception as e:
+                            st.error(f"계산 중 오류가 발생했습니다: {e}")
+                            expr = "Error"
+
+                    st.session_state.display_text = expr
+                    render_calc_display(display_slot)
+
+        # -------------------------------
+        # 1-4. 로그 연산
+        # -------------------------------
+        elif calc_mode == "로그 연산":
+            st.markdown(
+                """
+                <div class="calc-section">
+                    <div class="calc-section-title">로그 연산 설정</div>
+                    <div class="calc-section-caption">상용로그, 자연로그, 임의의 밑 로그를 계산합니다.</div>
+                </div>
+                """,
+                unsafe_allow_html=True
+            )
+
+            with st.container():
+                x = st.number_input("진수 (x, x > 0)", value=10.0, format="%.6f", key="log_x")
+
+                base_type = st.radio(
+                    "로그 종류 선택",
+                    ("상용로그 (log₁₀ x)", "자연로그 (ln x)", "밑을 내가 정하기"),
+                    horizontal=False
+                )
+
+                custom_base = None
+                expr = ""
+                if base_type == "밑을 내가 정하기":
+                    custom_base = st.number_input("밑 (b, b > 0, b ≠ 1)", value=2.0, format="%.6f", key="log_b")
+
+                if st.button("계산하기", key="log_calc"):
+                    if x <= 0:
+                        st.error("진수 x는 0보다 커야 합니다.")
+                        expr = "Error: x ≤ 0"
+                    else:
+                        try:
+                            if base_type == "상용로그 (log₁₀ x)":
+                                result = math.log10(x)
+                                expr = f"log₁₀({x}) = {result}"
+                            elif base_type == "자연로그 (ln x)":
+                                result = math.log(x)
+                                expr = f"ln({x}) = {result}"
+                            else:
+                                if custom_base is None:
+                                    st.error("밑 b를 입력해 주세요.")
+                                    expr = "Error: no base"
+                                elif custom_base <= 0 or custom_base == 1:
+                                    st.error("밑 b는 0보다 크고 1이 아니어야 합니다.")
+                                    expr = "Error: invalid base"
+                                else:
+                                    result = math.log(x) / math.log(custom_base)
+                                    expr = f"log₍{custom_base}₎({x}) = {result}"
+                        except ValueError:
+                            st.error("로그를 계산할 수 없는 입력입니다.")
+                            expr = "Error: invalid input"
+                        except Exception as e:
+                            st.error(f"계산 중 오류가 발생했습니다: {e}")
+                            expr = "Error"
+
+                    st.session_state.display_text = expr
+                    render_calc_display(display_slot)
+
+        # -------------------------------
+        # 1-5. 일괄 계산
+        # -------------------------------
+        elif calc_mode == "일괄 계산":
+            st.markdown(
+                """
+                <div class="calc-section">
+                    <div class="calc-section-title">일괄 계산 설정</div>
+                    <div class="calc-section-caption">CSV 파일을 올리거나 피연산자를 붙여 넣으면 모든 행을 한 번에 계산합니다.</div>
+                </div>
+                """,
+                unsafe_allow_html=True
+            )
+
+            with st.container():
+                batch_op = st.selectbox("연산 선택", tuple(BATCH_OPERATIONS), key="batch_op")
+                n_operands = BATCH_OPERATIONS[batch_op][0]
+
+                source = st.radio(
+                    "입력 방식",
+                    ("CSV 파일", "붙여 넣기"),
+                    horizontal=True,
+                    key="batch_source"
+                )
+
+                raw = None
+                if source == "CSV 파일":
+                    uploaded = st.file_uploader("피연산자 CSV", type=["csv"], key="batch_file")
+                    if uploaded is not None:
+                        # 붙여 넣기와 같은 규칙(머리글 판별, 구분자)으로 읽는다.
+                        raw = uploaded.getvalue()
+                else:
+                    text = st.text_area(
+                        "피연산자 (한 줄에 'a' 또는 'a,b')",
+                        height=150,
+                        key="batch_text"
+                    )
+                    if text.strip():
+                        raw = text
+
+                operands = None
+                if raw is not None:
+                    try:
+                        operands = parse_operands(raw)
+                    except OperandError as e:
+                        st.error(str(e))
+
+                col_a = col_b = None
+                if operands is not None:
+                    cols = list(operands.columns)
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        col_a = st.selectbox("a (x) 열", cols, index=0, key="batch_col_a")
+                    if n_operands == 2:
+                        with col2:
+                            col_b = st.selectbox(
+                                "b (n, 밑) 열", cols, index=min(1, len(cols) - 1), key="batch_col_b"
+                            )
+
+                if st.button("계산하기", key="batch_calc"):
+                    if operands is None:
+                        st.error("피연산자를 입력해 주세요.")
+                        expr = "Error: no input"
+                    else:
+                        a = operand_column(operands, col_a)
+                        b = operand_column(operands, col_b) if col_b is not None else None
+                        with span("calculate", rows=len(a)):
+                            result, errors = evaluate_batch(batch_op, a, b)
+                        # 내려받기 버튼을 누를 때 다시 계산하지 않도록 결과를 세션에 둔다.
+                        st.session_state.batch_result = (a, b, result, errors)
+                        expr = f"{len(result):,}개 계산 · 오류 {int(np.count_nonzero(errors)):,}개"
+
+                    st.session_state.display_text = expr
+                    render_calc_display(display_slot)
+
+                batch = st.session_state.get("batch_result")
+                if batch is not None:
+                    a, b, result, errors = batch
+                    summary = error_summary(errors)
+                    if summary:
+                        st.warning(" · ".join(f"{msg}: {n:,}개" for msg, n in summary.items()))
+
+                    preview = slice(0, BATCH_PREVIEW_ROWS)
+                    st.dataframe(batch_frame(
+                        a[preview], None if b is None else b[preview], result[preview], errors[preview]
+                    ))
+                    if len(result) > BATCH_PREVIEW_ROWS:
+                        st.caption(f"앞의 {BATCH_PREVIEW_ROWS:,}행만 표시합니다. 전체 결과는 CSV로 내려받으세요.")
+
+                    # CSV는 내려받기를 누를 때만 조각 단위로 만든다.
+                    st.download_button(
+                        "결과 CSV 내려받기",
+                        data=lambda: b"".join(iter_batch_csv(a, b, result, errors)),
+                        file_name="batch_result.csv",
+                        mime="text/csv",
+                        on_click="ignore",
+                        key="batch_download"
+                    )
+
+        # -------------------------------
+        # 1-6. 수식 계산
+        # -------------------------------
+        elif calc_mode == "수식 계산":
+            import pandas as pd
+
+            st.markdown(
+                """
+                <div class="calc-section">
+                    <div class="calc-section-title">수식 계산 설정</div>
+                    <div class="calc-section-caption">+ - × ÷, mod, ^, log(x), ln(x), log(x, b)를 조합한 수식을 계산합니다.</div>
+                </div>
+                """,
+                unsafe_allow_html=True
+            )
+
+            with st.container():
+                expr_text = st.text_input("수식", value="x ^ 2 + log(x, 2)", key="expr_text")
+
+                # 같은 수식은 한 번만 파싱/컴파일되고, 이후 실행은 캐시된 함수를 그대로 쓴다.
+                compiled = None
+                try:
+                    compiled = compile_expression(expr_text)
+                except ExpressionError as e:
+                    st.error(str(e))
+
+                bindings = {}
+                if compiled is not None:
+                    for name in compiled.variables:
+                        bindings[name] = st.text_input(
+                            f"{name} 값 (쉼표로 구분하면 여러 값을 한 번에 계산)",
+                            value="1, 2, 4, 8",
+                            key=f"expr_var_{name}"
+                        )
+
+                if st.button("계산하기", key="expr_calc"):
+                    if compiled is None:
+                        expr = "Error: invalid expression"
+                    else:
+                        try:
+                            values = {name: parse_values(text) for name, text in bindings.items()}
+                            with span("calculate"):
+                                result, errors = compiled.evaluate(**values)
+                        except ExpressionError as e:
+                            st.error(str(e))
+                            expr = "Error: invalid input"
+                        else:
+                            if result.ndim == 0 or result.size == 1:
+                                code = int(errors.flat[0])
+                                expr = ERROR_MESSAGES[code] if code else f"{expr_text} = {float(result.flat[0])}"
+                            else:
+                                table = {name: np.broadcast_to(v, result.shape) for name, v in values.items()}
+                                table["result"] = result
+                                table["error"] = [ERROR_MESSAGES[code] for code in errors]
+                                st.dataframe(pd.DataFrame(table))
+                                expr = f"{result.size:,}개 계산 · 오류 {int(np.count_nonzero(errors)):,}개"
+
+                    st.session_state.display_text = expr
+                    render_calc_display(display_slot)
+
+        # 계산기 카드 끝
+        st.markdown('</div>', unsafe_allow_html=True)
+
+    calculator_card(calc_mode)
@@ -0,0 +1,82 @@
+"""실행 시간 디버그 패널 (사이드바).
+
+주소에 ?debug=1을 붙이거나 MATHAPP_DEBUG_PANEL=1 환경 변수를 주면 사이드바에 이번 실행의
+단계별 시간, 그림 크기, 메모리와 최근 실행 기록이 나온다.
+"""
+
+import os
+from collections import deque
+
+import streamlit as st
+
+from ..tracing import add_run_listener, span
+
+DEBUG_PANEL_ENV = "MATHAPP_DEBUG_PANEL"
+TRACE_HISTORY_SIZE = 20
+
+
+def panel_enabled():
+    return os.environ.get(DEBUG_PANEL_ENV) == "1" or st.query_params.get("debug") == "1"
+
+
+def remember(trace):
+    # 끝난 실행을 이 세션의 최근 기록에 넣는다. (fragment만 다시 실행된 것도 포함)
+    history = st.session_state.setdefault("trace_history", deque(maxlen=TRACE_HISTORY_SIZE))
+    history.append(trace.to_record())
+
+
+add_run_listener(remember)
+
+
+def show_chart(fig, slot=None, nbytes=None, **kwargs):
+    """st.plotly_chart를 'serialize' 단계로 잰다. (Streamlit이 그림을 JSON으로 바꾸는 시간)
+
+    nbytes에 직렬화 크기를 알고 있으면 함께 기록한다. (그림 캐시에 있는 그림은 payload_nbytes로 공짜)
+    """
+    with span("serialize", bytes=nbytes):
+        return (slot or st).plotly_chart(fig, **kwargs)
+
+
+def _mb(nbytes):
+    return "-" if nbytes is None else f"{nbytes / 1024**2:,.1f} MB"
+
+
+def render_debug_panel():
+    history = st.session_state.get("trace_history")
+    if not history:
+        return
+    last = history[-1]
+    with st.sidebar.expander("⏱ 실행 시간 (디버그)", expanded=True):
+        tags = " · ".join(f"{k}={v}" for k, v in last["tags"].items())
+        st.caption(f"{last['kind']} · {last['seconds'] * 1000:,.1f} ms · {tags}")
+        delta = last.get("rss_delta")
+        st.caption(
+            f"RSS {_mb(last['rss_start'])} → {_mb(last['rss_end'])} "
+            f"({'-' if delta is None else f'{delta / 1024**2:+,.1f} MB'}) · "
+            f"프로세스 최대 {_mb(last.get('process_peak_rss'))}"
+        )
+        st.dataframe(
+            [
+                {
+                    "단계": s["stage"],
+                    "ms": round(s["seconds"] * 1000, 2),
+                    "KB": round(s["bytes"] / 1024, 1) if "bytes" in s else None,
+                    "태그": ", ".join(f"{k}={v}" for k, v in s.items() if k not in ("stage", "seconds", "bytes")),
+                }
+                for s in last["spans"]
+            ],
+            hide_index=True,
+        )
+        st.caption("최근 실행 (fragment만 다시 실행된 기록은 다음 전체 실행 때 함께 표시)")
+        st.dataframe(
+            [
+                {
+                    "시각": r["time"][11:19],
+                    "종류": r["kind"],
+                    "ms": round(r["seconds"] * 1000, 1),
+                    "태그": ", ".join(f"{k}={v}" for k, v in r["tags"].items() if k != "app_mode"),
+                }
+                for r in reversed(history)
+            ],
+            hide_index=True,
+        )
@@ -0,0 +1,277 @@
+"""연도별 세계 인구 분석 화면과 데이터 로더."""
+
+import streamlit as st
+
+from ..figures import (
+    FIGURE_WARMER,
+    get_continent_area,
+    get_movers_bar,
+    get_population_animation,
+    get_population_map,
+    get_share_map,
+    get_top_n_bar,
+    payload_nbytes,
+    plotly_config,
+    population_warm_up_tasks,
+)
+from ..population import (
+    PCT_COL,
+    POP_PROJECTION_MAX_YEAR,
+    POP_YEARS,
+    build_aggregates,
+    build_annual_frame,
+    build_bin_index,
+    load_population_frame,
+)
+from ..tracing import span, tag, traced_run
+from .debug_panel import show_chart
+
+# =============================================================================
+# 0. 데이터 로딩 함수 (세계 인구)
+# =============================================================================
+# main.py와 같은 폴더에 있는 world_population.csv 사용.
+# 열 저장소를 메모리 매핑으로 열어 두고, cache_resource로 세션 간에 같은 객체를 공유한다.
+# (cache_data처럼 매번 pickle/복사하지 않음. 읽기 전용이므로 호출하는 쪽에서 수정하지 말 것)
+@st.cache_resource
+def load_world_population():
+    df = load_population_frame()
+    return df
+
+
+# 모든 연도 열과 비율 열의 구간 코드를 데이터 로드당 한 번만 계산해 둔다.
+# 연도를 바꿀 때는 이 인덱스에서 열 하나를 꺼내기만 하면 된다. (복사/재구간화 없음)
+@st.cache_resource
+def load_bin_index():
+    return build_bin_index(load_world_population())
+
+
+# 1년 단위 보간/투영 프레임과 그 구간 인덱스. (데이터 버전, 마지막 연도)마다 한 번만 계산한다.
+@st.cache_resource
+def load_annual_population(version, horizon):
+    return build_annual_frame(load_world_population(), horizon)
+
+
+@st.cache_resource
+def load_annual_bin_index(version, horizon):
+    annual = load_annual_population(version, horizon)
+    return build_bin_index(annual, annual.attrs["years"])
+
+
+# 대륙 × 연도 합계와 연도별 순위. 보고 있는 프레임(스냅숏/1년 단위)마다 한 번만 계산한다.
+@st.cache_resource
+def load_aggregates(version, horizon):
+    if horizon is None:
+        return build_aggregates(load_world_population())
+    annual = load_annual_population(version, horizon)
+    return build_aggregates(annual, annual.attrs["years"])
+
+
+# 슬라이더로 처음 보는 연도도 캐시에서 꺼낸 그림과 같은 비용으로 보이도록, 보고 있는 화면의 그림을
+# 백그라운드 작업자 하나(FIGURE_WARMER)에 맡겨 미리 만든다. 재실행마다 넣어도 이미 만든 그림은 빠진다.
+#   observed: 1970~2022년 지도, 비율 지도 (모든 horizon이 함께 쓰는 키), 기본 화면의 애니메이션
+#   snapshot: CSV 스냅숏 프레임의 지도
+#   horizon : 고른 horizon이 더하는 투영 연도 지도와 그 애니메이션 (horizon을 바꾸면 이전 것은 버림)
+# 나중에 넣은 group을 먼저 만드므로, 지금 보고 있는 화면의 group을 마지막에 넣는다.
+# 지도는 화면이 실제로 그리는 쪽(경량 모드면 경량 지도)을 만든다.
+def warm_up_population_figures(version, horizon, lean):
+    default = load_annual_population(version, POP_YEARS[-1])
+    groups = {
+        "observed": population_warm_up_tasks(
+            default, load_annual_bin_index(version, POP_YEARS[-1]),
+            years=default.attrs["years"], animation_years=default.attrs["years"], lean=lean,
+        ),
+        "snapshot": population_warm_up_tasks(
+            load_world_population(), load_bin_index(), years=POP_YEARS, animation_years=POP_YEARS, lean=lean,
+        ),
+    }
+    if horizon is not None and horizon != POP_YEARS[-1]:
+        annual = load_annual_population(version, horizon)
+        years = annual.attrs["years"]
+        groups["horizon"] = population_warm_up_tasks(
+            annual, load_annual_bin_index(version, horizon),
+            years=[year for year in years if year > POP_YEARS[-1]], animation_years=years, share=False,
+            lean=lean,
+        )
+    else:
+        groups["horizon"] = []
+    order = ["snapshot", "observed", "horizon"] if horizon is not None else ["observed", "horizon", "snapshot"]
+    for group in order:
+        FIGURE_WARMER.submit(group, groups[group])
+
+
+# =============================================================================
+# 3. 연도별 세계인구 분석 앱
+# =============================================================================
+def render():
+    """연도별 세계 인구 분석 화면."""
+    st.subheader("🌍 연도별 세계 인구 분석")
+
+    st.markdown(
+        """
+        `world_population.csv` 데이터를 이용해서<br>
+        **연도별 세계 인구 분포**와 **세계 인구 비율(%)**을<br>
+        Plotly 세계지도에서 시각화합니다.
+        """,
+        unsafe_allow_html=True
+    )
+
+    with span("load"):
+        df_pop = load_world_population()
+    with span("binning"):
+        bin_index = load_bin_index()
+
+    mem = df_pop.attrs.get("memory_bytes")
+    if mem:
+        st.caption(
+            f"데이터 메모리: 기본 dtype {mem['default'] / 1024:,.1f} KB → "
+            f"압축 스키마 {mem['compact'] / 1024:,.1f} KB"
+        )
+
+    # 연도 단위: CSV 스냅숏 연도만 / 1년 단위 (스냅숏 사이 보간 + 2022년 이후 Growth Rate 투영)
+    annual_mode = st.checkbox("1년 단위 연도 보기 (스냅숏 사이는 보간)", value=True)
+    if annual_mode:
+        horizon = st.slider(
+            "투영할 마지막 연도 (2022년 이후는 Growth Rate로 추정)",
+            min_value=POP_YEARS[-1],
+            max_value=POP_PROJECTION_MAX_YEAR,
+            value=POP_YEARS[-1]
+        )
+        tag(horizon=horizon)
+        version = df_pop.attrs.get("version")
+        with span("load", frame="annual"):
+            df_view = load_annual_population(version, horizon)
+        with span("binning", frame="annual"):
+            index_view = load_annual_bin_index(version, horizon)
+        with span("aggregates"):
+            aggregates = load_aggregates(version, horizon)
+        year_list = df_view.attrs["years"]
+    else:
+        # CSV 컬럼: '1970 Population', '1980 Population', ...
+        df_view = df_pop
+        index_view = bin_index
+        with span("aggregates"):
+            aggregates = load_aggregates(df_pop.attrs.get("version"), None)
+        year_list = POP_YEARS
+        horizon = None
+
+    # 보기 방식: 서버 슬라이더(연도마다 재실행) / 애니메이션(브라우저 안에서 연도 전환)
+    view_mode = st.radio(
+        "보기 방식",
+        ("연도 선택", "애니메이션"),
+        horizontal=True
+    )
+    # 경량 모드: 필요한 열만 담은 단일 trace 지도 (전송량 감소)
+    lean = st.checkbox("경량 그림 모드 (필요한 열만 전송)", value=False)
+    warm_up_population_figures(df_pop.attrs.get("version"), horizon, lean)
+    chart_config = plotly_config()
+
+    # 지도 구역마다 fragment로 나눠, 연도 슬라이더를 움직이면 연도 지도 부분만 다시 실행한다.
+    @st.fragment
+    @traced_run("fragment", app_mode="연도별 세계인구 분석", section="population-map")
+    def population_map_section(df_view, index_view, year_list, view_mode, lean, chart_config):
+        if view_mode == "연도 선택":
+            # 슬라이더로 연도 선택
+            year = st.select_slider("연도 선택", options=year_list, value=POP_YEARS[-1])
+            tag(year=year)
+            if year not in POP_YEARS:
+                kind = "보간" if year < POP_YEARS[-1] else "Growth Rate 투영"
+                st.caption(f"※ {year}년 값은 CSV에 없는 연도라 {kind}으로 추정한 값입니다.")
+
+        st.markdown("---")
+
+        # -----------------------------
+        # 3-1. 해당 연도의 인구수 지도 (구간 색칠)
+        # -----------------------------
+        if view_mode == "애니메이션":
+            st.markdown("### 🗺 연도별 세계 인구 분포 (애니메이션)")
+            st.caption("지도 아래 슬라이더나 ▶ 버튼으로 연도를 바꿉니다. 연도 전환은 브라우저에서만 일어납니다.")
+
+            # 모든 연도를 프레임으로 담은 그림 하나를 만들어 캐시해 두고 그대로 보낸다.
+            with span("figure", chart="animation"):
+                fig_anim = get_population_animation(df_view, index_view, year_list)
+            nbytes = payload_nbytes(fig_anim)
+            show_chart(fig_anim, nbytes=nbytes, use_container_width=True, config=chart_config)
+            st.caption(f"그림 크기: {nbytes / 1024:,.1f} KB")
+
+        else:
+            st.markdown(f"### 🗺 {year}년 세계 인구 분포 (구간별 색칠)")
+
+            # 이 CSV에서는 연도 컬럼 이름이 '1980 Population' 형식
+            pop_col = f"{year} Population"
+            if pop_col not in df_view.columns:
+                st.error(f"데이터에 `{pop_col}` 컬럼이 없습니다. CSV 컬럼명을 확인하세요.")
+            else:
+                # 구간 코드는 미리 계산된 인덱스에서, 그림은 프로세스 전역 캐시에서 가져온다.
+                with span("figure", chart="population-map", year=year, lean=lean):
+                    fig_pop = get_population_map(df_view, index_view, year, lean=lean)
+
+                nbytes = payload_nbytes(fig_pop)
+                show_chart(fig_pop, nbytes=nbytes, use_container_width=True, config=chart_config)
+                st.caption(f"그림 크기: {nbytes / 1024:,.1f} KB")
+
+    @st.fragment
+    @traced_run("fragment", app_mode="연도별 세계인구 분석", section="share-map")
+    def share_map_section(df_view, index_view, lean, chart_config):
+        # -----------------------------
+        # 3-2. 세계 인구 비율(%) 기준 지도
+        # -----------------------------
+        st.markdown("### 🌎 세계 인구 비율(%)에 따른 구간 색칠")
+
+        if PCT_COL not in df_view.columns:
+            st.error("데이터에 'World Population Percentage' 컬럼이 없습니다.")
+        else:
+            with span("figure", chart="share-map", lean=lean):
+                fig_pct = get_share_map(df_view, index_view, lean=lean)
+
+            nbytes = payload_nbytes(fig_pct)
+            show_chart(fig_pct, nbytes=nbytes, use_container_width=True, config=chart_config)
+            st.caption(f"그림 크기: {nbytes / 1024:,.1f} KB")
+
+            st.caption(
+                "※ World Population Percentage 값은 각 나라 인구가 전체 세계 인구에서 차지하는 비율(%)입니다."
+            )
+
+    population_map_section(df_view, index_view, year_list, view_mode, lean, chart_config)
+
+    st.markdown("---")
+
+    share_map_section(df_view, index_view, lean, chart_config)
+
+    @st.fragment
+    @traced_run("fragment", app_mode="연도별 세계인구 분석", section="ranking")
+    def ranking_section(df_view, aggregates, year_list, chart_config):
+        # -----------------------------
+        # 3-3. 대륙별 합계 / 상위 국가 / 변화량
+        # -----------------------------
+        # 모두 데이터를 불러올 때 만든 집계 인덱스를 잘라 쓰므로 groupby/정렬을 다시 하지 않는다.
+        st.markdown("### 📊 대륙별 합계와 국가 순위")
+
+        with span("figure", chart="continent-area"):
+            fig_area = get_continent_area(df_view, aggregates)
+        show_chart(fig_area, nbytes=payload_nbytes(fig_area), use_container_width=True, config=chart_config)
+
+        col_year, col_n = st.columns(2)
+        with col_year:
+            rank_year = st.select_slider("순위 연도", options=year_list, value=POP_YEARS[-1], key="rank_year")
+        with col_n:
+            top_count = st.slider("표시할 국가 수", min_value=5, max_value=30, value=10, key="rank_n")
+        with span("figure", chart="top-n", year=rank_year):
+            fig_top = get_top_n_bar(df_view, aggregates, rank_year, top_count)
+        show_chart(fig_top, nbytes=payload_nbytes(fig_top), use_container_width=True, config=chart_config)
+
+        start_year, end_year = st.select_slider(
+            "변화량 비교 구간",
+            options=year_list,
+            value=(year_list[0], POP_YEARS[-1]),
+            key="mover_years"
+        )
+        if start_year == end_year:
+            st.info("서로 다른 두 연도를 골라 주세요.")
+        else:
+            with span("figure", chart="movers"):
+                fig_movers = get_movers_bar(df_view, aggregates, start_year, end_year, top_count)
+            show_chart(fig_movers, nbytes=payload_nbytes(fig_movers), use_container_width=True, config=chart_config)
+
+    st.markdown("---")
+
+    ranking_section(df_view, aggregates, year_list, chart_config)
@@ -0,0 +1,523 @@
+"""확률 시뮬레이터 화면과 보조 함수."""
+
+import math
+import multiprocessing
+import os
+import secrets
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from ..figures import figure_nbytes
+from ..simulation import (
+    SIM_CACHE,
+    SIM_MAX_TRIALS,
+    chi_square_test,
+    distribution_key,
+    exact_sum_distribution,
+    expected_run_histogram,
+    expected_runs,
+    face_probabilities,
+    run_statistics,
+    simulate_categorical_counts_seeded,
+    simulate_counts_seeded,
+    simulate_packed_flips,
+    simulate_sum_counts_seeded,
+    simulation_key,
+    stream_counts,
+    sum_draws_per_trial,
+    worker_seeds,
+)
+from ..tracing import span, tag, traced_run
+from .debug_panel import show_chart
+
+# =============================================================================
+# 0-1. 시뮬레이션 보조 함수
+# =============================================================================
+@st.cache_resource
+def get_sim_executor():
+    # 재실행마다 프로세스를 새로 띄우지 않도록 CPU 수 크기의 풀 하나를 모든 세션이 함께 쓴다.
+    # '작업자 수'는 시행을 나누는 조각 수일 뿐이라(결과는 worker_seeds로 정해짐) 풀 크기와 무관하다.
+    # 스레드가 많은 Streamlit 서버를 fork하지 않도록 spawn 방식을 사용한다.
+    return ProcessPoolExecutor(
+        max_workers=os.cpu_count() or 1,
+        mp_context=multiprocessing.get_context("spawn")
+    )
+
+
+# 실험별 결과 라벨과 그래프 문구
+SIM_EXPERIMENTS = {
+    "동전 던지기": {
+        "labels": ["앞면", "뒷면"],
+        "xaxis_title": "결과",
+        "title": "동전 던지기 상대도수",
+        "info": "이론적으로는 앞면과 뒷면의 확률이 각각 0.5에 가깝게 나타나야 합니다.",
+    },
+    "주사위 던지기": {
+        "labels": [1, 2, 3, 4, 5, 6],
+        "xaxis_title": "눈",
+        "title": "주사위 눈의 상대도수",
+        "info": "이론적으로는 1~6의 각 눈이 모두 확률 1/6 ≈ 0.167 에 가깝게 나타나야 합니다.",
+    },
+}
+
+
+def counts_to_frame(labels, counts):
+    # 도수 벡터 -> 결과 / 도수 / 상대도수 표
+    counts = np.asarray(counts)
+    freq = pd.DataFrame({"결과": labels, "도수": counts})
+    freq["상대도수"] = counts / counts.sum()
+    return freq
+
+
+@span("figure", chart="freq-bar")
+def make_freq_bar(freq, exp_cfg, n_done):
+    # 결과가 아주 많으면 막대 위 숫자는 생략한다. (읽을 수 없고 그림만 커짐)
+    text = freq["상대도수"].map(lambda x: f"{x:.3f}") if len(freq) <= FREQ_BAR_MAX_TEXT else None
+    fig = px.bar(freq, x="결과", y="상대도수", text=text)
+    if text is not None:
+        fig.update_traces(textposition="outside")
+    fig.update_layout(
+        yaxis_title="상대도수",
+        xaxis_title=exp_cfg["xaxis_title"],
+        title=f"{exp_cfg['title']} (시행 횟수: {n_done})"
+    )
+    return fig
+
+
+@span("figure", chart="convergence")
+def make_convergence_line(xs, ys, exp_cfg):
+    # 시행 횟수에 따른 누적 상대도수 (큰 수의 법칙). x축은 로그 스케일.
+    labels = exp_cfg["labels"]
+    df_conv = pd.DataFrame(ys, columns=[str(label) for label in labels])
+    df_conv["시행 횟수"] = xs
+    df_conv = df_conv.melt(id_vars="시행 횟수", var_name="결과", value_name="상대도수")
+
+    fig = px.line(df_conv, x="시행 횟수", y="상대도수", color="결과", log_x=True)
+    fig.add_hline(y=1 / len(labels), line_dash="dash", line_color="gray")
+    fig.update_layout(
+        yaxis_range=[0, 1],
+        title="누적 상대도수의 수렴 (큰 수의 법칙)"
+    )
+    return fig
+
+
+# 여러 주사위의 합 실험의 설정 범위
+DICE_SUM_EXPERIMENT = "여러 주사위의 합"
+DICE_MAX_COUNT = 1000
+DICE_MAX_FACES = 100
+# 한 번 실행에서 만드는 난수 개수 상한 (시행 횟수 × 시행당 난수 개수). 실행 중에는 취소할 수
+# 없으므로 동전/주사위의 최대 시행 횟수와 같은 양으로 묶는다.
+DICE_MAX_DRAWS = SIM_MAX_TRIALS
+
+
+# 사용자 정의 실험: 결과별 가중치 프리셋 (가중치는 합이 1이 아니어도 됨)
+CUSTOM_EXPERIMENT = "사용자 정의 실험"
+CUSTOM_PRESETS = {
+    "편향된 동전": (["앞면", "뒷면"], [0.7, 0.3]),
+    "조작된 주사위": ([1, 2, 3, 4, 5, 6], [1, 1, 1, 1, 1, 3]),
+    "룰렛 색 (유럽식)": (["빨강", "검정", "초록(0)"], [18, 18, 1]),
+    "룰렛 번호 (0~36)": (list(range(37)), [1] * 37),
+    "큰 바퀴 (10,000칸, 칸 번호에 비례)": (list(range(1, 10_001)), list(range(1, 10_001))),
+}
+# 막대 위에 상대도수 숫자를 적는 최대 결과 개수
+FREQ_BAR_MAX_TEXT = 50
+
+
+def parse_outcomes(text):
+    # 한 줄에 '결과, 가중치'. 쉼표나 결과 이름이 없거나, 가중치가 유한한 0 이상의 수가 아니면 ValueError.
+    labels = []
+    weights = []
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        label, comma, weight = line.rpartition(",")
+        if not comma or not label.strip():
+            raise ValueError(f"'결과, 가중치' 형식이 아닙니다: {line.strip()}")
+        labels.append(label.strip())
+        weights.append(float(weight))
+    if not labels or not all(math.isfinite(w) and w >= 0 for w in weights) or sum(weights) <= 0:
+        raise ValueError("가중치는 0 이상이고 합이 0보다 커야 합니다.")
+    return labels, weights
+
+
+def cached_counts(key, compute, seeded=True):
+    """시드 고정 실행 결과를 프로세스 전역 캐시에서 찾고, 없으면 계산해 넣는다.
+
+    같은 설정을 다른 세션이 이미 실행했다면 바로 돌려준다. 캐시 적중/실패 수를 함께 보여 준다.
+    시드를 비워 둔 실행(seeded=False)은 다시 찾을 일이 없으므로 캐시를 거치지 않고 계산만 한다.
+    (무작위 결과가 공유되는 시드 고정 결과를 밀어내지 않도록)
+    """
+    if not seeded:
+        with st.spinner("시뮬레이션 중..."), span("simulate", cache_hit=False):
+            return compute()
+
+    hit = key in SIM_CACHE
+    with st.spinner("시뮬레이션 중..."), span("simulate", cache_hit=hit):
+        counts = SIM_CACHE.get_or_compute(key, compute)
+    stats = SIM_CACHE.stats()
+    st.caption(
+        f"결과 캐시: {'적중 (다시 계산하지 않음)' if hit else '새로 계산'} · "
+        f"적중 {stats['hits']:,} / 실패 {stats['misses']:,} · "
+        f"{stats['entries']:,}개, {stats['bytes'] / 1024:,.1f} KB"
+    )
+    return counts
+
+
+@span("figure", chart="dice-sum")
+def make_sum_chart(freq, pmf, n_dice, n_faces, n_done):
+    # 시뮬레이션 상대도수(막대) 위에 합성곱으로 구한 정확한 분포(선)를 겹쳐 그린다.
+    fig = px.bar(freq, x="결과", y="상대도수")
+    fig.add_scatter(x=freq["결과"], y=pmf, mode="lines", name="정확한 분포")
+    fig.update_layout(
+        yaxis_title="상대도수",
+        xaxis_title="눈의 합",
+        title=f"주사위 {n_dice}개(면 {n_faces}개) 눈의 합 (시행 횟수: {n_done})"
+    )
+    return fig
+
+
+@span("figure", chart="run-histogram")
+def make_run_histogram(histogram, expected):
+    # 런 길이별 개수(막대)와 공정한 동전에서의 기댓값(선). 긴 런은 드물어서 y축은 로그 스케일.
+    lengths = np.arange(1, len(histogram))
+    df_runs = pd.DataFrame({"런 길이": lengths, "런 개수": histogram[1:]})
+    fig = px.bar(df_runs, x="런 길이", y="런 개수", log_y=True)
+    fig.add_scatter(x=lengths, y=expected[1:], mode="lines+markers", name="기댓값")
+    fig.update_layout(title="런(같은 면이 연속으로 나온 구간) 길이 분포")
+    return fig
+
+
+def show_sim_chart(fig, **kwargs):
+    # 시뮬레이터 그림은 그림 캐시에 없으므로 직렬화 크기를 직접 재서 show_chart에 넘긴다.
+    return show_chart(fig, nbytes=figure_nbytes(fig), **kwargs)
+
+
+def render_run_analysis(n_trials, seed):
+    """동전 결과를 비트 압축 배열로 만들고 런 통계를 보여 준다. (시행당 1비트)"""
+    exp_cfg = SIM_EXPERIMENTS["동전 던지기"]
+    st.caption(f"시드: {seed} · 비트 압축 저장")
+    with st.spinner("시뮬레이션 중..."), span("simulate", packed=True):
+        packed = simulate_packed_flips(n_trials, np.random.default_rng(worker_seeds(seed, 1)[0]))
+        stats = run_statistics(packed, n_trials)
+
+    counts = [stats["heads"], n_trials - stats["heads"]]
+    freq = counts_to_frame(exp_cfg["labels"], counts)
+    show_sim_chart(make_freq_bar(freq, exp_cfg, n_trials), use_container_width=True)
+    st.caption(
+        f"저장 크기: {packed.nbytes / 1024**2:,.2f} MB "
+        f"(문자열 리스트였다면 포인터만 약 {n_trials * 8 / 1024**2:,.0f} MB)"
+    )
+
+    mean_runs, sd_runs = expected_runs(n_trials)
+    z = (stats["n_runs"] - mean_runs) / sd_runs if sd_runs else 0.0
+    col_runs, col_heads, col_tails = st.columns(3)
+    col_runs.metric("런 개수", f"{stats['n_runs']:,}", f"기댓값 대비 z = {z:+.2f}", delta_color="off")
+    col_heads.metric("최장 앞면 런", stats["longest"][1])
+    col_tails.metric("최장 뒷면 런", stats["longest"][0])
+
+    histogram = stats["histogram"]
+    expected = expected_run_histogram(n_trials, len(histogram) - 1)
+    show_sim_chart(make_run_histogram(histogram, expected), use_container_width=True)
+    st.info(
+        f"공정한 동전이라면 런 개수의 기댓값은 {mean_runs:,.1f}, 표준편차는 {sd_runs:,.1f}입니다. "
+        "길이가 L인 런은 대략 L이 1 늘 때마다 절반으로 줄어듭니다."
+    )
+
+
+def run_stream_job(job):
+    """시행을 배치 단위로 돌리며 배치마다 상대도수 막대와 수렴 곡선을 갱신한다.
+
+    실행 중 아무 위젯이나 누르면 Streamlit이 스크립트를 다시 시작하므로 현재 실행이 멈춘다.
+    배치마다 session_state에 중간 결과를 남겨 중지 후에도 그때까지의 결과를 보여 준다.
+    """
+    exp_cfg = SIM_EXPERIMENTS[job["experiment"]]
+    n_trials = job["n_trials"]
+    seed = job["seed"]
+
+    tag(experiment=job["experiment"], n_trials=n_trials, stream=True)
+    st.caption(f"시드: {seed} · 스트리밍 실행")
+    st.button("중지")
+    progress = st.progress(0.0)
+    bar_slot = st.empty()
+    line_slot = st.empty()
+
+    # 일괄 실행(작업자 1명)과 같은 시드 유도를 써서, 같은 시드면 실행 방식과 관계없이 같은 결과가 나온다.
+    rng = np.random.default_rng(worker_seeds(seed, 1)[0])
+    xs_all = []
+    ys_all = []
+    for done, counts, xs, ys in stream_counts(len(exp_cfg["labels"]), n_trials, rng):
+        xs_all.append(xs)
+        ys_all.append(ys)
+        result = dict(job, done=done, counts=counts, xs=np.concatenate(xs_all), ys=np.concatenate(ys_all))
+        st.session_state.sim_stream = result
+
+        progress.progress(done / n_trials, text=f"{done:,} / {n_trials:,} 회")
+        freq = counts_to_frame(exp_cfg["labels"], counts)
+        show_sim_chart(make_freq_bar(freq, exp_cfg, done), slot=bar_slot, use_container_width=True)
+        show_sim_chart(
+            make_convergence_line(result["xs"], result["ys"], exp_cfg),
+            slot=line_slot,
+            use_container_width=True
+        )
+
+    st.dataframe(freq)
+    st.info(exp_cfg["info"])
+
+
+def render_stream_partial(partial):
+    partial_cfg = SIM_EXPERIMENTS[partial["experiment"]]
+    st.warning(
+        f"시뮬레이션이 중지되었습니다. "
+        f"({partial['done']:,} / {partial['n_trials']:,} 회, 시드: {partial['seed']})"
+    )
+    freq = counts_to_frame(partial_cfg["labels"], partial["counts"])
+    show_sim_chart(
+        make_freq_bar(freq, partial_cfg, partial["done"]), use_container_width=True
+    )
+    show_sim_chart(
+        make_convergence_line(partial["xs"], partial["ys"], partial_cfg),
+        use_container_width=True
+    )
+
+
+
+# =============================================================================
+# 2. 확률 시뮬레이터 앱
+# =============================================================================
+def render():
+    """확률 시뮬레이터 화면."""
+    st.subheader("🎲 확률 시뮬레이터")
+
+    st.markdown(
+        """
+        동전 또는 주사위를 선택하고 시행 횟수를 정한 뒤<br>
+        시뮬레이션을 실행하면 **실제 상대도수**를 Plotly 그래프로 볼 수 있습니다.
+        """,
+        unsafe_allow_html=True
+    )
+
+    # 설정과 일괄 실행은 fragment로 묶어, 조작하면 이 부분만 다시 실행한다.
+    @st.fragment
+    @traced_run("fragment", app_mode="확률 시뮬레이터", section="simulator")
+    def simulator_panel():
+        # 실험 설정
+        col_exp, col_n = st.columns(2)
+        with col_exp:
+            experiment = st.radio(
+                "실험 종류",
+                ("동전 던지기", "주사위 던지기", DICE_SUM_EXPERIMENT, CUSTOM_EXPERIMENT)
+            )
+        with col_n:
+            n_trials = st.number_input(
+                "시행 횟수",
+                min_value=1,
+                max_value=SIM_MAX_TRIALS,
+                value=1000,
+                step=100
+            )
+
+        # 여러 주사위의 합: 주사위 개수 / 면 수 / (선택) 면별 가중치
+        probs = None
+        if experiment == DICE_SUM_EXPERIMENT:
+            col_m, col_k = st.columns(2)
+            with col_m:
+                n_dice = st.number_input("주사위 개수", min_value=1, max_value=DICE_MAX_COUNT, value=10, step=1)
+            with col_k:
+                n_faces = st.number_input("면 수", min_value=2, max_value=DICE_MAX_FACES, value=6, step=1)
+            weights_text = st.text_input(
+                "면별 가중치 (쉼표로 구분, 비워 두면 공정한 주사위)",
+                value="",
+                placeholder="예: 1, 1, 1, 1, 1, 2"
+            )
+            try:
+                weights = [float(w) for w in weights_text.split(",")] if weights_text.strip() else None
+                probs = face_probabilities(n_faces, weights)
+            except ValueError:
+                st.error(f"가중치는 0 이상인 수 {n_faces}개를 쉼표로 구분해 입력해 주세요.")
+
+        # 사용자 정의 실험: 프리셋 또는 직접 입력한 (결과, 가중치)
+        outcomes = None
+        if experiment == CUSTOM_EXPERIMENT:
+            preset = st.selectbox("실험 선택", (*CUSTOM_PRESETS, "직접 입력"))
+            if preset == "직접 입력":
+                outcomes_text = st.text_area(
+                    "결과와 가중치 (한 줄에 '결과, 가중치')",
+                    value="당첨, 1\n꽝, 9",
+                    height=150
+                )
+                try:
+                    outcomes = parse_outcomes(outcomes_text)
+                except ValueError:
+                    st.error("한 줄에 '결과, 가중치' 형식으로, 가중치는 0 이상인 수로 입력해 주세요.")
+            else:
+                outcomes = CUSTOM_PRESETS[preset]
+                st.caption(f"결과 {len(outcomes[0]):,}개")
+
+        # 실행 방식 / 시드 설정
+        col_mode, col_seed = st.columns(2)
+        with col_mode:
+            exec_mode = st.radio(
+                "실행 방식",
+                ("단일 프로세스", "멀티 프로세스")
+            )
+            n_workers = 1
+            if exec_mode == "멀티 프로세스":
+                n_workers = st.number_input(
+                    "작업자 수",
+                    min_value=1,
+                    max_value=64,
+                    value=os.cpu_count() or 1,
+                    step=1
+                )
+        with col_seed:
+            seed_input = st.number_input(
+                "시드 (비워 두면 무작위)",
+                min_value=0,
+                max_value=2**32 - 1,
+                value=None,
+                step=1
+            )
+
+        stream_mode = st.checkbox(
+            "실시간 스트리밍 표시 (배치마다 그래프 갱신, 단일 프로세스로 실행)",
+            value=False
+        )
+
+        packed_mode = False
+        if experiment == "동전 던지기":
+            packed_mode = st.checkbox(
+                "연속 기록(런) 분석 · 결과를 1비트씩 압축 저장 (단일 프로세스로 실행)",
+                value=False
+            )
+
+        run = st.button("시뮬레이션 실행하기")
+        tag(experiment=experiment, n_trials=n_trials)
+
+        if run and experiment == DICE_SUM_EXPERIMENT:
+            if probs is None:
+                return
+            draws = n_trials * sum_draws_per_trial(n_dice, n_faces)
+            if draws > DICE_MAX_DRAWS:
+                st.error(
+                    f"한 번에 뽑는 난수가 너무 많습니다. ({draws:,}개, 최대 {DICE_MAX_DRAWS:,}개) "
+                    "시행 횟수나 주사위 개수를 줄여 주세요."
+                )
+                return
+            seed = secrets.randbits(32) if seed_input is None else int(seed_input)
+            st.session_state.pop("sim_stream", None)
+            executor = get_sim_executor() if n_workers > 1 else None
+            st.caption(f"시드: {seed} · 작업자 수: {n_workers}")
+            if stream_mode:
+                st.caption("※ 여러 주사위의 합 실험은 스트리밍 없이 한 번에 실행합니다.")
+
+            key = simulation_key(
+                DICE_SUM_EXPERIMENT, (n_dice, distribution_key(probs)), n_trials, seed, n_workers
+            )
+            counts = cached_counts(
+                key, lambda: simulate_sum_counts_seeded(n_dice, probs, n_trials, seed, n_workers, executor),
+                seeded=seed_input is not None
+            )
+            # 정확한 분포는 (주사위 개수, 면별 확률)마다 한 번만 계산해 캐시한다.
+            pmf = exact_sum_distribution(n_dice, tuple(probs))
+            test = chi_square_test(counts, pmf)
+
+            labels = np.arange(n_dice, n_dice * n_faces + 1)
+            freq = counts_to_frame(labels, counts)
+            freq["이론 확률"] = pmf
+            show_sim_chart(make_sum_chart(freq, pmf, n_dice, n_faces, n_trials), use_container_width=True)
+            st.caption(
+                f"카이제곱 적합도 검정: χ² = {test['statistic']:,.2f}, 자유도 {test['dof']}, "
+                f"p ≈ {test['p_value']:.4f} (기대도수 5 미만인 구간은 하나로 합쳐 계산)"
+            )
+            st.dataframe(freq)
+            st.info("시행 횟수가 많아질수록 막대(상대도수)가 선(정확한 분포)에 가까워집니다.")
+            return
+
+        if run and experiment == CUSTOM_EXPERIMENT:
+            if outcomes is None:
+                return
+            labels, weights = outcomes
+            probs = np.asarray(weights, dtype=np.float64) / sum(weights)
+            seed = secrets.randbits(32) if seed_input is None else int(seed_input)
+            st.session_state.pop("sim_stream", None)
+            executor = get_sim_executor() if n_workers > 1 else None
+            st.caption(f"시드: {seed} · 작업자 수: {n_workers}")
+            if stream_mode:
+                st.caption("※ 사용자 정의 실험은 스트리밍 없이 한 번에 실행합니다.")
+
+            # 별칭 표는 분포마다 한 번 만들어 캐시되고, 결과 개수와 관계없이 표본당 O(1)로 뽑는다.
+            key = simulation_key(CUSTOM_EXPERIMENT, distribution_key(probs), n_trials, seed, n_workers)
+            counts = cached_counts(
+                key, lambda: simulate_categorical_counts_seeded(probs, n_trials, seed, n_workers, executor),
+                seeded=seed_input is not None
+            )
+            test = chi_square_test(counts, probs)
+
+            freq = counts_to_frame([str(label) for label in labels], counts)
+            freq["이론 확률"] = probs
+            exp_cfg = {"xaxis_title": "결과", "title": f"{CUSTOM_EXPERIMENT} 상대도수"}
+            show_sim_chart(make_freq_bar(freq, exp_cfg, n_trials), use_container_width=True)
+            st.caption(
+                f"카이제곱 적합도 검정: χ² = {test['statistic']:,.2f}, 자유도 {test['dof']}, "
+                f"p ≈ {test['p_value']:.4f} (기대도수 5 미만인 구간은 하나로 합쳐 계산)"
+            )
+            st.dataframe(freq)
+            return
+
+        exp_cfg = SIM_EXPERIMENTS.get(experiment)
+
+        if run:
+            # 시드를 비워 두면 새로 만들고 화면에 보여 주어 같은 결과를 다시 재현할 수 있게 한다.
+            seed = secrets.randbits(32) if seed_input is None else int(seed_input)
+            st.session_state.pop("sim_stream", None)
+
+            if packed_mode:
+                render_run_analysis(n_trials, seed)
+                return
+
+            if stream_mode:
+                # fragment 안의 위젯 클릭은 실행 중인 스크립트를 끊지 못한다. 스트리밍은 전체 실행으로
+                # 넘겨서 돌려야 '중지' 버튼(=전체 재실행)으로 멈출 수 있다.
+                st.session_state.sim_stream_job = {
+                    "experiment": experiment,
+                    "n_trials": n_trials,
+                    "seed": seed,
+                }
+                st.rerun()
+
+            # -----------------------------
+            # 일괄 시뮬레이션
+            # -----------------------------
+            executor = get_sim_executor() if n_workers > 1 else None
+            st.caption(f"시드: {seed} · 작업자 수: {n_workers}")
+
+            n_outcomes = len(exp_cfg["labels"])
+            key = simulation_key(experiment, n_outcomes, n_trials, seed, n_workers)
+            counts = cached_counts(
+                key, lambda: simulate_counts_seeded(n_outcomes, n_trials, seed, n_workers, executor),
+                seeded=seed_input is not None
+            )
+            freq = counts_to_frame(exp_cfg["labels"], counts)
+
+            show_sim_chart(make_freq_bar(freq, exp_cfg, n_trials), use_container_width=True)
+            st.dataframe(freq)
+
+            st.info(exp_cfg["info"])
+
+    simulator_panel()
+
+    # -----------------------------
+    # 스트리밍 시뮬레이션 (전체 실행에서 진행)
+    # -----------------------------
+    stream_job = st.session_state.pop("sim_stream_job", None)
+    if stream_job is not None:
+        run_stream_job(stream_job)
+    else:
+        # 스트리밍 실행이 중간에 멈췄다면 그때까지의 결과를 보여 준다.
+        partial = st.session_state.get("sim_stream")
+        if partial is not None and partial["done"] < partial["n_trials"]:
+            render_stream_partial(partial)
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# 저장소 루트(main.py가 있는 폴더)를 import 경로에 넣어 mathapp 패키지를 바로 불러온다.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
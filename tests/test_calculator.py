@@ -0,0 +1,39 @@
+import os
+
+import pytest
+
+from mathapp.calculator import OperandError, parse_operands
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [
+        "1,2\n3,4,5",          # 줄마다 칸 수가 다름 (ParserError)
+        b"",                   # 빈 파일 (EmptyDataError)
+        "a,b\n1,2".encode("utf-16"),  # UTF-8이 아닌 파일 (UnicodeDecodeError)
+    ],
+)
+def test_parse_operands_rejects_unreadable_input(raw):
+    with pytest.raises(OperandError):
+        parse_operands(raw)
+
+
+def test_parse_operands_same_rule_for_text_and_bytes():
+    text = "a,b\n1,2\n6,3"
+    from_text = parse_operands(text)
+    from_bytes = parse_operands(text.encode("utf-8-sig"))
+    assert list(from_text.columns) == list(from_bytes.columns) == ["a", "b"]
+    assert from_text.values.tolist() == from_bytes.values.tolist() == [[1, 2], [6, 3]]
+
+
+def test_batch_page_shows_error_for_ragged_paste():
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(os.path.join(ROOT, "main.py"), default_timeout=60).run()
+    next(r for r in at.radio if r.label == "계산 모드 선택").set_value("일괄 계산").run()
+    next(r for r in at.radio if r.label == "입력 방식").set_value("붙여 넣기").run()
+    at.text_area(key="batch_text").set_value("1,2\n3,4,5").run()
+    assert not at.exception
+    assert any("값의 개수" in e.value for e in at.error)
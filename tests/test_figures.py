@@ -0,0 +1,35 @@
+import threading
+
+from mathapp.figures import FigureCache, FigureWarmer, population_map_key
+from mathapp.population import build_annual_frame, load_population_frame
+
+
+def test_observed_year_maps_are_shared_across_horizons():
+    df = load_population_frame()
+    a2030 = build_annual_frame(df, 2030)
+    a2050 = build_annual_frame(df, 2050)
+    assert population_map_key(a2030, 1995) == population_map_key(a2050, 1995)
+    assert population_map_key(a2030, 2022) == population_map_key(a2050, 2022)
+    assert population_map_key(a2030, 2030) != population_map_key(a2050, 2030)
+
+
+def test_warmer_replaces_stale_group():
+    cache = FigureCache()
+    warmer = FigureWarmer(cache)
+    gate = threading.Event()
+    built = []
+
+    def task(name):
+        def build():
+            gate.wait()
+            built.append(name)
+            return {"name": name}
+        return (name, build)
+
+    warmer.submit("horizon", [task("old-1"), task("old-2"), task("old-3")])
+    warmer.submit("horizon", [task("new-1")])
+    gate.set()
+    assert warmer.wait_idle(10)
+    # 새 목록을 넣기 전에 이미 시작한 그림(많아야 하나)만 남고 나머지 이전 작업은 버려진다.
+    assert "new-1" in built
+    assert len([name for name in built if name.startswith("old")]) <= 1
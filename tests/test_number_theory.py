@@ -0,0 +1,33 @@
+import random
+import time
+
+import pytest
+
+from mathapp.number_theory import BudgetExceeded, factorize, is_probable_prime
+
+
+def _large_odd(bits, seed=1):
+    # 작은 소수로 나누어떨어지지 않아 Miller–Rabin까지 가는 큰 홀수
+    rng = random.Random(seed)
+    while True:
+        n = rng.getrandbits(bits) | (1 << (bits - 1)) | 1
+        if all(n % p for p in range(3, 1000, 2)):
+            return n
+
+
+@pytest.mark.parametrize("fn", [is_probable_prime, factorize])
+def test_large_input_stops_within_time_budget(fn):
+    # 16,000비트면 Miller–Rabin 한 번(a^d mod n)만 10초 넘게 걸린다.
+    n = _large_odd(16_000)
+    budget = 0.3
+    t0 = time.perf_counter()
+    with pytest.raises(BudgetExceeded):
+        fn(n, time_budget=budget)
+    assert time.perf_counter() - t0 < budget + 0.5
+
+
+def test_primality_results_unchanged():
+    assert is_probable_prime(2**89 - 1)
+    assert not is_probable_prime(2**89 + 1)
+    assert is_probable_prime(2**521 - 1, time_budget=None)
+    assert factorize(2**64 + 1) == {274177: 1, 67280421310721: 1}
@@ -0,0 +1,23 @@
+import numpy as np
+import pytest
+
+from mathapp.simulation import simulate_counts_seeded, stream_counts, worker_seeds
+
+
+@pytest.mark.parametrize(
+    "n_outcomes, n_trials, chunk_size",
+    [
+        (2, 12_345, 1 << 20),     # 동전
+        (6, 12_345, 1 << 20),     # 주사위 (uint8 버퍼 경계에 민감)
+        (6, 50_000, 777),         # 배치 경계가 청크 한가운데에 걸리는 경우
+    ],
+)
+def test_stream_matches_single_worker_batch(n_outcomes, n_trials, chunk_size):
+    seed = 42
+    batch = simulate_counts_seeded(n_outcomes, n_trials, seed, chunk_size=chunk_size)
+    rng = np.random.default_rng(worker_seeds(seed, 1)[0])
+    *_, (done, counts, xs, ys) = stream_counts(n_outcomes, n_trials, rng, chunk_size=chunk_size)
+    assert done == n_trials
+    np.testing.assert_array_equal(counts, batch)
+    assert xs[-1] == n_trials
+    np.testing.assert_allclose(ys[-1], batch / n_trials)
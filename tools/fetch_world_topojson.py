@@ -0,0 +1,54 @@
+"""Plotly가 쓰는 세계 지도 topojson을 받아 static/topojson/ 에 저장한다.
+
+인터넷이 되는 곳에서 한 번 실행해 두면, 앱은 Plotly CDN 대신 앱의 정적 파일에서 지도를
+받아 가므로 인터넷이 없는 서버에서도 choropleth가 그려진다.
+
+    python tools/fetch_world_topojson.py
+
+choropleth에 쓰지 않는 강/호수 레이어는 빼서 파일을 줄인다.
+
+받은 파일은 저장소에 커밋하지 않는다. static/topojson/world_110m.json이 없으면
+plotly_config()가 빈 설정을 돌려주고, 브라우저는 Plotly 기본값인 CDN에서 지도를 받는다.
+"""
+import argparse
+import json
+import os
+import sys
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from mathapp.figures import LOCAL_TOPOJSON_DIR, WORLD_TOPOJSON_FILE  # noqa: E402
+
+DEFAULT_BASE_URL = "https://cdn.plot.ly/un/"
+# 국가 경계/해안선/육지/바다만 남긴다. (rivers, lakes 등은 layout.geo에서 켜지 않는 한 쓰이지 않음)
+KEEP_OBJECTS = ("countries", "land", "ocean", "coastlines")
+
+
+def simplify_topology(topo):
+    topo["objects"] = {name: obj for name, obj in topo["objects"].items() if name in KEEP_OBJECTS}
+    return topo
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    parser.add_argument("--out-dir", default=LOCAL_TOPOJSON_DIR)
+    args = parser.parse_args()
+
+    url = args.base_url + WORLD_TOPOJSON_FILE
+    with urllib.request.urlopen(url) as resp:
+        raw = resp.read()
+    topo = simplify_topology(json.loads(raw))
+    data = json.dumps(topo, separators=(",", ":")).encode("utf-8")
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    out_path = os.path.join(args.out_dir, WORLD_TOPOJSON_FILE)
+    with open(out_path, "wb") as f:
+        f.write(data)
+    print(f"{url} -> {out_path} ({len(raw):,} -> {len(data):,} bytes)")
+
+
+if __name__ == "__main__":
+    main()